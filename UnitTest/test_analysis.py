@@ -9,11 +9,17 @@ Unit tests for the analysis and reporting components with strict verification.
 from test_base import BaseTestCase
 import os
 import json
+import datetime
+import shutil
+import tempfile
+import threading
 import numpy as np
 from unittest.mock import patch, MagicMock
 import matplotlib.pyplot as plt
-from stock_sim.analysis import calculate_statistics, save_simulation_data
-from stock_sim.analysis.reporting import generate_stock_report, generate_batch_report
+from stock_sim.analysis import calculate_statistics, save_simulation_data, save_simulation_data_async, save_many
+from stock_sim.analysis.data_storage import load_simulation_data, cleanup_raw_data, index_data_dir
+from stock_sim.analysis.reporting import generate_stock_report, generate_batch_report, generate_reports
+from stock_sim.analysis.reporting import _interpret, _SKEWNESS_SCALE
 from stock_sim.analysis.statistics import calculate_max_drawdown, calculate_max_drawdown_across_paths
 
 
@@ -109,6 +115,15 @@ class TestAnalysis(BaseTestCase):
         self.assertTrue(np.isfinite(stats_nan['expected_return']))
         self.assertTrue(np.isfinite(stats_nan['return_volatility']))
     
+    def test_calculate_statistics_float32_paths(self):
+        """Test that single-precision paths give the same statistics as double precision."""
+        stats64 = calculate_statistics(self.test_ticker, self.deterministic_paths.astype(np.float64), 100.0)
+        stats32 = calculate_statistics(self.test_ticker, self.deterministic_paths.astype(np.float32), 100.0)
+        
+        for key in ('mean_final_price', 'median_final_price', 'expected_return', 'max_drawdown', 'var_95'):
+            self.assertAlmostEqual(stats32[key], stats64[key], places=4)
+        self.assertIsInstance(stats32['mean_final_price'], float)
+    
     def test_calculate_max_drawdown_strict(self):
         """Test maximum drawdown calculation with strict verification."""
         # Test case 1: Known drawdown pattern
@@ -289,6 +304,7 @@ class TestAnalysis(BaseTestCase):
         # Check confidence interval ordering
         self.assertLess(stats['return_ci_lower'], stats['return_ci_upper'])
     
+    @patch('stock_sim.analysis.data_storage.has_orjson', False)
     @patch('stock_sim.analysis.data_storage.os.path.exists')
     @patch('stock_sim.analysis.data_storage.os.makedirs')
     @patch('stock_sim.analysis.data_storage.open', new_callable=MagicMock)
@@ -320,6 +336,105 @@ class TestAnalysis(BaseTestCase):
         self.assertEqual(saved_stats['initial_price'], 100.0)
         self.assertAlmostEqual(saved_stats['mean_final_price'], 103.0)
     
+    def test_save_and_load_simulation_data_roundtrip(self):
+        """Test that saved binary paths load back unchanged."""
+        stats = calculate_statistics(self.test_ticker, self.deterministic_paths, 100.0)
+        for file_format in ('npy', 'csv', 'csv.gz'):
+            output_dir = tempfile.mkdtemp()
+            try:
+                saved = save_simulation_data(self.test_ticker, self.deterministic_paths, stats, output_dir,
+                                             file_format=file_format)
+                self.assertTrue(saved['paths'].endswith('.' + file_format))
+                
+                loaded_paths, loaded_stats = load_simulation_data(self.test_ticker, output_dir, mmap_mode='r')
+                np.testing.assert_array_equal(loaded_paths, self.deterministic_paths)
+                self.assertAlmostEqual(loaded_stats['mean_final_price'], 103.0)
+                if file_format == 'npy':
+                    self.assertIsInstance(loaded_paths, np.memmap)
+                    self.assertEqual(loaded_paths.dtype, np.float32)
+                del loaded_paths
+            finally:
+                shutil.rmtree(output_dir)
+    
+    def test_sample_paths_stored_as_indices(self):
+        """Test that the sample is kept as indices into the full paths and survives cleanup."""
+        output_dir = tempfile.mkdtemp()
+        try:
+            stats = calculate_statistics(self.test_ticker, self.paths_matrix, self.test_initial_price)
+            saved = save_simulation_data(self.test_ticker, self.paths_matrix, stats, output_dir)
+            self.assertIsNone(saved['sample'])
+            self.assertNotIn('sample_indices', stats)
+            
+            sample_paths, loaded_stats = load_simulation_data(self.test_ticker, output_dir, sample=True)
+            expected = self.paths_matrix[loaded_stats['sample_indices']].astype(np.float32)
+            np.testing.assert_array_equal(sample_paths, expected)
+            
+            # Deleting the full paths writes the sample rows to their own file first
+            self.assertEqual(cleanup_raw_data(data_dir=output_dir), 1)
+            remaining_paths, _ = load_simulation_data(self.test_ticker, output_dir)
+            np.testing.assert_array_equal(remaining_paths, expected)
+            
+            # A later run replaces the sample materialized for the earlier one
+            new_paths = self.paths_matrix * 2
+            new_stats = calculate_statistics(self.test_ticker, new_paths, self.test_initial_price)
+            save_simulation_data(self.test_ticker, new_paths, new_stats, output_dir)
+            self.assertEqual(cleanup_raw_data(data_dir=output_dir), 1)
+            remaining_paths, loaded_stats = load_simulation_data(self.test_ticker, output_dir)
+            expected = new_paths[loaded_stats['sample_indices']].astype(np.float32)
+            np.testing.assert_array_equal(remaining_paths, expected)
+        finally:
+            shutil.rmtree(output_dir)
+    
+    def test_save_simulation_data_async(self):
+        """Test saving simulation data on the background writer."""
+        output_dir = tempfile.mkdtemp()
+        try:
+            stats = calculate_statistics(self.test_ticker, self.deterministic_paths, 100.0)
+            future = save_simulation_data_async(self.test_ticker, self.deterministic_paths, stats, output_dir)
+            saved = future.result(timeout=30)
+            
+            self.assertTrue(os.path.exists(saved['paths']))
+            loaded_paths, _ = load_simulation_data(self.test_ticker, output_dir)
+            np.testing.assert_array_equal(loaded_paths, self.deterministic_paths)
+        finally:
+            shutil.rmtree(output_dir)
+    
+    def test_stats_file_nan_policy(self):
+        """Test that both JSON writers store non-finite statistics as null."""
+        from stock_sim.analysis import data_storage
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir, ignore_errors=True)
+        stats = {'mean': np.float64('nan'), 'max': float('inf'), 'std': 1.5,
+                 'percentiles': {'5': np.float32('nan')}, 'values': np.array([1.0, np.nan])}
+        
+        contents = []
+        for use_orjson in ([False, True] if data_storage.has_orjson else [False]):
+            stats_file = os.path.join(output_dir, f'stats_{use_orjson}.json')
+            with patch.object(data_storage, 'has_orjson', use_orjson):
+                data_storage._write_stats_file(stats, stats_file)
+            with open(stats_file) as f:
+                contents.append(json.load(f))
+        
+        for loaded in contents:
+            self.assertEqual(loaded, {'mean': None, 'max': None, 'std': 1.5,
+                                      'percentiles': {'5': None}, 'values': [1.0, None]})
+    
+    def test_save_many(self):
+        """Test saving several tickers concurrently."""
+        output_dir = tempfile.mkdtemp()
+        try:
+            stats = calculate_statistics(self.test_ticker, self.deterministic_paths, 100.0)
+            items = [(ticker, self.deterministic_paths * (i + 1), stats) for i, ticker in enumerate(['AAA', 'BBB', 'CCC'])]
+            saved = save_many(items, output_dir, max_workers=2)
+            
+            self.assertEqual(set(saved), {'AAA', 'BBB', 'CCC'})
+            dir_index = index_data_dir(output_dir)
+            for i, ticker in enumerate(['AAA', 'BBB', 'CCC']):
+                loaded_paths, _ = load_simulation_data(ticker, output_dir, dir_index=dir_index)
+                np.testing.assert_array_equal(loaded_paths, self.deterministic_paths * (i + 1))
+        finally:
+            shutil.rmtree(output_dir)
+    
     @patch('matplotlib.pyplot.savefig')
     @patch('matplotlib.pyplot.figure')
     @patch('os.path.exists')
@@ -360,6 +475,162 @@ class TestAnalysis(BaseTestCase):
             generate_stock_report(self.test_ticker, result, output_dir)
             self.assertTrue(mock_open.called)
     
+    def test_generate_reports(self):
+        """Test generating the reports for several tickers in worker processes."""
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir, ignore_errors=True)
+        
+        stats = calculate_statistics(self.test_ticker, self.deterministic_paths, 100.0)
+        results = {
+            ticker: {'statistics': stats, 'model_type': 'gbm', 'simulation_config': {'paths': 5}}
+            for ticker in ('AAA', 'BBB', 'CCC')
+        }
+        report_paths = generate_reports(results, output_dir, max_workers=2)
+        
+        self.assertEqual(set(report_paths), set(results))
+        for ticker, report_path in report_paths.items():
+            self.assertTrue(os.path.basename(report_path).startswith(f"{ticker}_report_"))
+            with open(report_path) as f:
+                self.assertIn(f"{ticker} Stock Price Simulation", f.read())
+        self.assertTrue(os.path.exists(os.path.join(output_dir, 'assets', 'report.css')))
+    
+    def test_generate_stock_report_reuses_cached_body(self):
+        """Test that an identical stock report is reused from the cache with a fresh timestamp."""
+        from stock_sim.analysis import reporting
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir, ignore_errors=True)
+        
+        stats = calculate_statistics(self.test_ticker, self.deterministic_paths, 100.0)
+        result = {'statistics': stats, 'model_type': 'gbm', 'simulation_config': {'paths': 5}}
+        with patch.dict(os.environ, {'REPORT_CACHE_P': '1'}):
+            first_path = generate_stock_report(self.test_ticker, result, output_dir)
+        with open(first_path) as f:
+            self.assertNotIn(reporting._GENERATED_ON_MARK, f.read())
+        
+        with patch('stock_sim.analysis.reporting.datetime') as mock_datetime, \
+                patch('stock_sim.analysis.reporting._get_template') as mock_get_template:
+            mock_datetime.datetime.now.return_value = datetime.datetime(2030, 1, 2, 3, 4, 5)
+            report_path = generate_stock_report(self.test_ticker, result, output_dir)
+        
+        mock_get_template.assert_not_called()
+        with open(report_path) as f:
+            self.assertIn("Generated on: 2030-01-02 03:04:05", f.read())
+        
+        # Editing the template invalidates the cached reports
+        key = reporting._report_cache_key(self.test_ticker, 'gbm', stats, 5)
+        with patch.object(reporting, '_template_stamp', return_value=[0, 0]):
+            self.assertNotEqual(reporting._report_cache_key(self.test_ticker, 'gbm', stats, 5), key)
+    
+    def test_generate_batch_report_reuses_render(self):
+        """Test that an identical batch report is reused from the cache with a fresh timestamp."""
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir, ignore_errors=True)
+        
+        stats = calculate_statistics(self.test_ticker, self.deterministic_paths, 100.0)
+        results = {self.test_ticker: {'statistics': stats, 'model_params': {'mu': 0.1, 'sigma': 0.2}}}
+        with patch.dict(os.environ, {'REPORT_CACHE_P': '1'}):
+            first_path = generate_batch_report(results, output_dir)
+        
+        with patch('stock_sim.analysis.reporting.datetime') as mock_datetime, \
+                patch('stock_sim.analysis.reporting._get_template') as mock_get_template:
+            mock_datetime.datetime.now.return_value = datetime.datetime(2030, 1, 2, 3, 4, 5)
+            second_path = generate_batch_report(results, output_dir)
+        
+        mock_get_template.assert_not_called()
+        self.assertNotEqual(first_path, second_path)
+        with open(first_path) as f1, open(second_path) as f2:
+            first, second = f1.read(), f2.read()
+        self.assertIn("Generated on: 2030-01-02 03:04:05", second)
+        self.assertEqual(first.split("Generated on:")[0], second.split("Generated on:")[0])
+        self.assertTrue(os.path.samefile(second_path, os.path.join(output_dir, 'consolidated_report.html')))
+        self.assertTrue(os.path.exists(os.path.join(output_dir, 'assets', 'batch_report.css')))
+    
+    def test_render_cache_admission(self):
+        """Test that the render cache admits the configured fraction of reports."""
+        from stock_sim.analysis import reporting
+        with patch.object(reporting, '_RENDER_CACHE', reporting.collections.OrderedDict()), \
+                patch.object(reporting, '_render_cache_acc', 0.0), \
+                patch.dict(os.environ, {'REPORT_CACHE_P': '0.25'}):
+            for i in range(8):
+                if reporting._render_cache_admit():
+                    reporting._render_cache_put(f"key{i}", f"<html>{i}</html>")
+            self.assertEqual(list(reporting._RENDER_CACHE), ['key3', 'key7'])
+    
+    def test_atomic_open_threads(self):
+        """Test that threads writing the same file each write their own temporary file."""
+        from concurrent.futures import ThreadPoolExecutor
+        from stock_sim.analysis.reporting import atomic_open
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir, ignore_errors=True)
+        path = os.path.join(output_dir, 'report.html')
+        contents = [str(worker) * 100000 for worker in range(4)]
+        all_open = threading.Barrier(len(contents))
+        
+        def write(content):
+            with atomic_open(path) as f:
+                all_open.wait(timeout=10)
+                for i in range(0, len(content), 1000):
+                    f.write(content[i:i + 1000])
+        
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(write, contents))
+        
+        with open(path) as f:
+            self.assertIn(f.read(), contents)
+        self.assertEqual(os.listdir(output_dir), ['report.html'])
+    
+    def test_link_or_copy_leaves_other_files_alone(self):
+        """Test that linking never writes into an existing file, even when linking fails."""
+        from stock_sim.analysis import reporting
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir, ignore_errors=True)
+        old_path, new_path, target = (os.path.join(output_dir, name) for name in
+                                      ('old.html', 'new.html', 'consolidated.html'))
+        with open(old_path, 'w') as f:
+            f.write("OLD")
+        with open(new_path, 'w') as f:
+            f.write("NEW")
+        
+        # A leftover temporary link to another report under the same name
+        os.link(old_path, target + '.tmp')
+        with patch.object(reporting, '_temp_name', return_value=target + '.tmp'):
+            with self.assertRaises(FileExistsError):
+                reporting._link_or_copy(new_path, target)
+        
+        # File systems without hard links fall back to a fresh copy
+        with patch('os.link', side_effect=PermissionError):
+            reporting._link_or_copy(new_path, target)
+        with open(old_path) as f_old, open(target) as f_target:
+            self.assertEqual((f_old.read(), f_target.read()), ("OLD", "NEW"))
+    
+    def test_render_cache_threads(self):
+        """Test that the render cache can be used from several threads at once."""
+        from concurrent.futures import ThreadPoolExecutor
+        from stock_sim.analysis import reporting
+        
+        def use_cache(worker):
+            for i in range(2000):
+                key = f"key{(worker + i) % 8}"
+                reporting._render_cache_get(key)
+                if reporting._render_cache_admit():
+                    reporting._render_cache_put(key, "<html></html>")
+        
+        with patch.object(reporting, '_RENDER_CACHE', reporting.collections.OrderedDict()), \
+                patch.object(reporting, 'RENDER_CACHE_SIZE', 2), \
+                patch.dict(os.environ, {'REPORT_CACHE_P': '1'}):
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                list(pool.map(use_cache, range(4)))
+            self.assertLessEqual(len(reporting._RENDER_CACHE), 2)
+    
+    def test_interpret_skewness_boundaries(self):
+        """Test that skewness values on the band boundaries keep their labels."""
+        self.assertEqual(_interpret(-0.5, _SKEWNESS_SCALE), 'Strong Negative Skew (Downside Risk)')
+        self.assertEqual(_interpret(-0.3, _SKEWNESS_SCALE), 'Slight Negative Skew')
+        self.assertEqual(_interpret(-0.1, _SKEWNESS_SCALE), 'Symmetric')
+        self.assertEqual(_interpret(0.1, _SKEWNESS_SCALE), 'Symmetric')
+        self.assertEqual(_interpret(0.5, _SKEWNESS_SCALE), 'Slight Positive Skew')
+        self.assertEqual(_interpret(0.6, _SKEWNESS_SCALE), 'Strong Positive Skew (Upside Potential)')
+    
     @patch('matplotlib.pyplot.savefig')
     @patch('matplotlib.pyplot.figure')
     @patch('os.path.exists')
@@ -452,19 +452,84 @@ class TestModelCoverage(unittest.TestCase):
             jump_sigma=0.05
         )
         
-        # Force jumps by controlling random numbers
-        with patch('numpy.random.random', return_value=np.zeros(10)):  # Always below jump_prob
-            # Run simulations that will definitely have jumps
-            jump_paths = jump_model.simulate(paths=10, steps=5)
-            hybrid_paths = hybrid_model.simulate(paths=10, steps=5)
-            
-            # Verify results
-            self.assertEqual(jump_paths.shape, (10, 6))
-            self.assertEqual(hybrid_paths.shape, (10, 6))
+        # Force jumps by controlling the models' random streams
+        forced_rng = MagicMock(wraps=np.random.default_rng(0))
+        forced_rng.poisson.return_value = 50  # Jumps scattered over the whole grid
+        jump_model._rng = forced_rng
+        hybrid_model.jump_model._rng = forced_rng
+        
+        # Run simulations that will definitely have jumps
+        jump_paths = jump_model.simulate(paths=10, steps=5)
+        hybrid_paths = hybrid_model.simulate(paths=10, steps=5)
+        
+        # Verify results
+        self.assertEqual(jump_paths.shape, (10, 6))
+        self.assertEqual(hybrid_paths.shape, (10, 6))
+        
+        # Check that paths include the initial price
+        self.assertTrue(np.all(jump_paths[:, 0] == jump_model.initial_price))
+        self.assertTrue(np.all(hybrid_paths[:, 0] == hybrid_model.initial_price))
+    
+    @patch('yfinance.download')
+    def test_seeded_simulation_is_reproducible(self, mock_yf_download):
+        """Test that models given the same seed produce identical paths."""
+        mock_yf_download.return_value = self.mock_data
+        
+        for model_class in (GBMModel, JumpDiffusionModel, HybridModel):
+            first = model_class(self.test_ticker, calibrate=False, seed=42).simulate(paths=20, steps=10)
+            second = model_class(self.test_ticker, calibrate=False, seed=42).simulate(paths=20, steps=10)
+            other = model_class(self.test_ticker, calibrate=False, seed=7).simulate(paths=20, steps=10)
             
-            # Check that paths include the initial price
-            self.assertTrue(np.all(jump_paths[:, 0] == jump_model.initial_price))
-            self.assertTrue(np.all(hybrid_paths[:, 0] == hybrid_model.initial_price))
+            np.testing.assert_array_equal(first, second)
+            self.assertFalse(np.array_equal(first, other))
+    
+    @patch('yfinance.download')
+    def test_antithetic_simulation(self, mock_yf_download):
+        """Test that antithetic variates mirror the diffusion shocks across path pairs."""
+        mock_yf_download.return_value = self.mock_data
+        
+        model = GBMModel(self.test_ticker, calibrate=False, mu=0.05, sigma=0.2,
+                         seed=3, antithetic=True)
+        self.assertTrue(model.antithetic)
+        paths = model.simulate(paths=10, steps=6)
+        
+        # Each twin's shocks cancel, leaving twice the drift in the summed log-returns
+        log_growth = np.log(paths[:, 1:] / model.initial_price)
+        drift = (model.mu - 0.5 * model.sigma**2) / 252 * np.arange(1, 7)
+        np.testing.assert_allclose(log_growth[:5] + log_growth[5:], np.tile(2 * drift, (5, 1)), atol=1e-12)
+        
+        # Odd path counts and step-major layouts are supported too
+        hybrid_model = HybridModel(self.test_ticker, calibrate=False, seed=3, antithetic=True)
+        hybrid_paths = hybrid_model.simulate(paths=7, steps=6)
+        self.assertEqual(hybrid_paths.shape, (7, 7))
+        self.assertTrue(np.all(np.isfinite(hybrid_paths)))
+    
+    @patch('yfinance.download')
+    def test_generate_jumps(self, mock_yf_download):
+        """Test batch generation of jumps for whole paths."""
+        mock_yf_download.return_value = self.mock_data
+        
+        jump_model = JumpDiffusionModel(
+            self.test_ticker,
+            calibrate=False,
+            jump_intensity=10,
+            jump_mean=-0.1,
+            jump_sigma=0.05
+        )
+        
+        # A fixed number of jumps is scattered over the grid
+        forced_rng = MagicMock(wraps=np.random.default_rng(0))
+        jump_model._rng = forced_rng
+        forced_rng.poisson.return_value = 20
+        jumps = jump_model.generate_jumps(10, 5, dt=1/252)
+        self.assertEqual(jumps.shape, (10, 5))
+        self.assertTrue(0 < np.count_nonzero(jumps) <= 20)
+        
+        # No jumps leaves the matrix at zero
+        forced_rng.poisson.return_value = 0
+        jumps = jump_model.generate_jumps(10, 5, dt=1/252, dtype=np.float32)
+        self.assertEqual(jumps.dtype, np.float32)
+        self.assertTrue(np.all(jumps == 0))
 
 
 if __name__ == '__main__':
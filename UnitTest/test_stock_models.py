@@ -13,6 +13,7 @@ import pandas as pd
 import sys
 import os
 import time
+import tempfile
 
 # Add the project root to the path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -20,6 +21,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from stock_sim.models.gbm_model import GBMModel
 from stock_sim.models.jump_diffusion_model import JumpDiffusionModel
 from stock_sim.models.hybrid_model import HybridModel
+from stock_sim.models.base_model import fetch_historical_data, fetch_historical_data_batch, iter_historical_data, CACHE_DIR_ENV
 
 
 class TestStockModels(unittest.TestCase):
@@ -114,6 +116,10 @@ class TestStockModels(unittest.TestCase):
             jump_sigma=self.jump_sigma
         )
         
+        # The composed jump model should reuse the data rather than download it again
+        self.assertEqual(mock_yf_download.call_count, 1)
+        self.assertIs(model.jump_model.historical_data, model.historical_data)
+        
         # Generate paths
         paths = model.simulate(paths=self.test_paths, steps=self.test_steps)
         
@@ -126,6 +132,34 @@ class TestStockModels(unittest.TestCase):
         # Check that no prices are negative
         self.assertTrue(np.all(paths >= 0))
     
+    @patch('yfinance.download')
+    def test_float32_simulation(self, mock_yf_download):
+        """Test that all models can simulate in single precision."""
+        mock_yf_download.return_value = self._create_mock_stock_data()
+        
+        for model_class in (GBMModel, JumpDiffusionModel, HybridModel):
+            model = model_class(self.test_ticker, calibrate=False, mu=self.mu, sigma=self.sigma)
+            paths = model.simulate(paths=self.test_paths, steps=self.test_steps, dtype=np.float32)
+            
+            self.assertEqual(paths.dtype, np.float32)
+            self.assertEqual(paths.shape, (self.test_paths, self.test_steps + 1))
+            self.assertTrue(np.all(np.isfinite(paths)))
+    
+    @patch('yfinance.download')
+    def test_repeated_simulations_are_independent(self, mock_yf_download):
+        """Test that reused scratch buffers never leak into returned paths."""
+        mock_yf_download.return_value = self._create_mock_stock_data()
+        
+        for model_class in (GBMModel, JumpDiffusionModel, HybridModel):
+            model = model_class(self.test_ticker, calibrate=False, mu=self.mu, sigma=self.sigma)
+            first = model.simulate(paths=self.test_paths, steps=self.test_steps)
+            first_copy = first.copy()
+            second = model.simulate(paths=self.test_paths, steps=self.test_steps)
+            
+            # The second run must not overwrite the first run's result
+            np.testing.assert_array_equal(first, first_copy)
+            self.assertFalse(np.shares_memory(first, second))
+    
     @patch('yfinance.download')
     def test_model_validation(self, mock_yf_download):
         """Test parameter validation in the models."""
@@ -140,6 +174,54 @@ class TestStockModels(unittest.TestCase):
         with self.assertRaises(ValueError):
             model = GBMModel(ticker, calibrate=False)
     
+    @patch('yfinance.download')
+    def test_prefetched_historical_data(self, mock_yf_download):
+        """Test batch fetching and passing pre-fetched data to a model."""
+        mock_yf_download.return_value = self._create_mock_stock_data()
+        
+        # Fetch several tickers concurrently
+        data = fetch_historical_data_batch(["AAPL", "MSFT", "GOOG"], period="1y")
+        self.assertEqual(set(data.keys()), {"AAPL", "MSFT", "GOOG"})
+        self.assertEqual(mock_yf_download.call_count, 3)
+        
+        # A model given pre-fetched data should not download again
+        mock_yf_download.reset_mock()
+        model = GBMModel(self.test_ticker, calibrate=False, mu=self.mu, sigma=self.sigma,
+                         historical_data=data["AAPL"])
+        mock_yf_download.assert_not_called()
+        self.assertAlmostEqual(model.initial_price, float(data["AAPL"]['Close'].iloc[-1]))
+    
+    @patch('yfinance.download')
+    def test_iter_historical_data_window(self, mock_yf_download):
+        """Test that iterating downloads in order and stays a bounded window ahead."""
+        mock_yf_download.return_value = self._create_mock_stock_data()
+        tickers = ["AAPL", "MSFT", "GOOG", "AMZN", "META"]
+        
+        self.assertEqual([ticker for ticker, _ in iter_historical_data(tickers, max_workers=2)], tickers)
+        
+        # Stopping after the first ticker leaves the rest of the list undownloaded
+        mock_yf_download.reset_mock()
+        prefetched = iter_historical_data(tickers, max_workers=2)
+        ticker, data = next(prefetched)
+        prefetched.close()
+        self.assertEqual(ticker, "AAPL")
+        self.assertFalse(data.empty)
+        self.assertLessEqual(mock_yf_download.call_count, 3)
+    
+    @patch('yfinance.download')
+    def test_historical_data_disk_cache(self, mock_yf_download):
+        """Test that cached downloads are reused when the cache is enabled."""
+        mock_yf_download.return_value = self._create_mock_stock_data()
+        
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with patch.dict(os.environ, {CACHE_DIR_ENV: cache_dir}):
+                first = fetch_historical_data(self.test_ticker, "1y")
+                second = fetch_historical_data(self.test_ticker, "1y")
+        
+        # Only the first call should reach yfinance
+        self.assertEqual(mock_yf_download.call_count, 1)
+        pd.testing.assert_frame_equal(first, second)
+    
     def _create_mock_stock_data(self):
         """Create mock stock data for testing."""
         # Create a simple price series with upward trend
@@ -5,15 +5,18 @@ Statistical analysis and data handling for simulation results.
 """
 
 from .statistics import calculate_statistics, calculate_max_drawdown, calculate_max_drawdown_across_paths
-from .data_storage import save_simulation_data, cleanup_raw_data
-from .reporting import generate_stock_report, generate_batch_report
+from .data_storage import save_simulation_data, save_simulation_data_async, save_many, cleanup_raw_data
+from .reporting import generate_stock_report, generate_batch_report, generate_reports
 
 __all__ = [
     'calculate_statistics',
     'calculate_max_drawdown',
     'calculate_max_drawdown_across_paths',
     'save_simulation_data',
+    'save_simulation_data_async',
+    'save_many',
     'generate_stock_report',
     'generate_batch_report',
+    'generate_reports',
     'cleanup_raw_data'
 ] 
\ No newline at end of file
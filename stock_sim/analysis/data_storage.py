@@ -7,26 +7,219 @@ Functions for saving and loading simulation data.
 """
 
 import os
+import gzip
+import math
 import json
 import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# orjson serializes numpy scalars and arrays in C; fall back to the
+# json module with NumpyEncoder when it is not installed
+try:
+    import orjson
+    has_orjson = True
+except ImportError:
+    has_orjson = False
+
+# pyarrow provides the Parquet writer, which stores the paths as compressed
+# binary columns, and a multi-threaded CSV parser for legacy text files
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    has_pyarrow = True
+except ImportError:
+    has_pyarrow = False
+
+# Extensions of the supported paths file formats, in the order they are probed on load
+PATHS_EXTENSIONS = (".npy", ".parquet", ".csv", ".csv.gz")
+
+# Rows converted per Parquet row group, bounding the memory used for large matrices
+PATHS_CHUNK_ROWS = 10_000
+
+# Buffer size for text outputs written in many small pieces (CSV rows, json.dump)
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Background writers for save_simulation_data_async; threads start on first use
+_writer_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="simulation-writer")
 
 
 class NumpyEncoder(json.JSONEncoder):
     """Custom JSON encoder for numpy types."""
     def default(self, obj):
-        if isinstance(obj, (np.int_, np.intc, np.intp, np.int8,
-                            np.int16, np.int32, np.int64, np.uint8,
-                            np.uint16, np.uint32, np.uint64)):
+        if isinstance(obj, np.integer):
             return int(obj)
-        elif isinstance(obj, (np.float_, np.float16, np.float32, np.float64)):
+        elif isinstance(obj, np.floating):
             return float(obj)
         elif isinstance(obj, (np.ndarray,)):
             return obj.tolist()
         return json.JSONEncoder.default(self, obj)
 
 
-def save_simulation_data(ticker, simulation_paths, statistics, output_dir, save_full_paths=True):
+def _paths_schema(paths):
+    """Arrow schema of a paths matrix: one column per time step, named by its index."""
+    return pa.schema([(str(i), pa.from_numpy_dtype(paths.dtype)) for i in range(paths.shape[1])])
+
+
+def _paths_record_batches(paths, schema):
+    """
+    Convert a paths matrix to Arrow record batches straight from the ndarray.
+    
+    Converting one block of rows at a time, without a DataFrame in between,
+    keeps the extra memory bounded by PATHS_CHUNK_ROWS rather than the matrix size.
+    
+    Args:
+        paths (numpy.ndarray): Paths matrix to convert
+        schema (pyarrow.Schema): Schema from _paths_schema
+        
+    Yields:
+        pyarrow.RecordBatch: Up to PATHS_CHUNK_ROWS rows of paths
+    """
+    for start in range(0, paths.shape[0], PATHS_CHUNK_ROWS):
+        chunk = paths[start:start + PATHS_CHUNK_ROWS]
+        yield pa.record_batch([pa.array(chunk[:, i]) for i in range(chunk.shape[1])], schema=schema)
+
+
+def _write_csv(paths, f):
+    """
+    Write a paths matrix as CSV with an integer column header.
+    
+    Args:
+        paths (numpy.ndarray): Paths matrix to write
+        f (file): Binary file object to write to
+    """
+    if has_pyarrow:
+        # Arrow's C++ writer formats whole columnar batches at a time
+        schema = _paths_schema(paths)
+        with pa_csv.CSVWriter(f, schema) as writer:
+            for batch in _paths_record_batches(paths, schema):
+                writer.write_batch(batch)
+        return
+    
+    # Format the ndarray directly instead of going through a DataFrame, with
+    # just enough digits for the values to survive a round trip; np.savetxt
+    # writes one row at a time, so only a single row's string is ever in memory
+    fmt = '%.9g' if paths.dtype == np.float32 else '%.17g'
+    header = ','.join(map(str, range(paths.shape[1])))
+    np.savetxt(f, paths, fmt=fmt, delimiter=',', header=header, comments='')
+
+
+def _write_paths_file(paths, base_path, file_format):
+    """
+    Write a paths matrix to disk in the requested format.
+    
+    Args:
+        paths (numpy.ndarray): Paths matrix to write
+        base_path (str): File path without extension
+        file_format (str): 'npy', 'parquet', 'csv' or 'csv.gz'
+        
+    Returns:
+        str: Path of the written file
+        
+    Raises:
+        ValueError: If the file format is unknown
+    """
+    if file_format == 'npy':
+        file_path = base_path + ".npy"
+        with open(file_path, 'wb') as f:
+            np.save(f, paths, allow_pickle=False)
+    elif file_format == 'parquet':
+        file_path = base_path + ".parquet"
+        schema = _paths_schema(paths)
+        with pq.ParquetWriter(file_path, schema, compression='zstd', compression_level=1) as writer:
+            for batch in _paths_record_batches(paths, schema):
+                writer.write_table(pa.Table.from_batches([batch]))
+    elif file_format in ('csv', 'csv.gz'):
+        file_path = base_path + "." + file_format
+        # Rows go through a large buffer so they are not flushed to the OS in
+        # small pieces; level 1 gzip cuts the bytes several times over at little
+        # CPU cost, unlike gzip's default level 9
+        with open(file_path, 'wb', buffering=WRITE_BUFFER_SIZE) as raw:
+            if file_format == 'csv.gz':
+                with gzip.open(raw, 'wb', compresslevel=1) as f:
+                    _write_csv(paths, f)
+            else:
+                _write_csv(paths, raw)
+    else:
+        raise ValueError(f"Unknown paths file format: {file_format}")
+    
+    return file_path
+
+
+def _nan_to_none(value):
+    """
+    Replace NaN and infinite floats with None, recursing into dicts, lists and arrays.
+    
+    orjson can only write non-finite floats as null, so both JSON writers
+    are given the same sanitized statistics and produce the same file.
+    
+    Args:
+        value: Statistics value to sanitize
+        
+    Returns:
+        The value with every non-finite float replaced by None
+    """
+    if isinstance(value, dict):
+        return {key: _nan_to_none(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_nan_to_none(item) for item in value]
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind != 'f' or np.isfinite(value).all():
+            return value
+        return _nan_to_none(value.tolist())
+    if isinstance(value, (float, np.floating)) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _write_stats_file(statistics, stats_file):
+    """
+    Write the statistics dictionary as indented JSON.
+    
+    NaN and infinite values are written as null and load back as None.
+    
+    Args:
+        statistics (dict): Statistics to write
+        stats_file (str): Path of the JSON file
+    """
+    statistics = _nan_to_none(statistics)
+    if has_orjson:
+        with open(stats_file, 'wb') as f:  # One write of the whole document
+            f.write(orjson.dumps(statistics, default=NumpyEncoder().default,
+                                 option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2
+                                 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(stats_file, 'w', buffering=WRITE_BUFFER_SIZE) as f:
+            json.dump(statistics, f, cls=NumpyEncoder, indent=2)
+
+
+def _remove_stale_paths_files(ticker, output_dir, keep):
+    """
+    Delete a ticker's paths and sample files left by earlier saves.
+    
+    The loaders pick the first file they find, so a sample materialized by
+    cleanup_raw_data for an earlier run, or a file in another format, would
+    otherwise shadow the data just saved.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        output_dir (str): Directory containing saved data
+        keep (str): Path of the file just written
+    """
+    for name in (f"{ticker}_paths", f"{ticker}_sample_paths"):
+        for ext in PATHS_EXTENSIONS:
+            file_path = os.path.join(output_dir, name + ext)
+            if file_path == keep:
+                continue
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+
+
+def save_simulation_data(ticker, simulation_paths, statistics, output_dir, save_full_paths=True,
+                         file_format='npy', dtype='float32'):
     """
     Save simulation data to disk.
     
@@ -36,90 +229,245 @@ def save_simulation_data(ticker, simulation_paths, statistics, output_dir, save_
         statistics (dict): Calculated statistics
         output_dir (str): Directory to save files
         save_full_paths (bool): Whether to save the full paths matrix (can be large)
+        file_format (str): Format of the paths files: 'npy' (default), 'parquet'
+            (requires pyarrow), 'csv' (legacy, slow and large) or 'csv.gz'
+            (gzip-compressed CSV for when text output is required)
+        dtype (str or numpy.dtype): Floating point type the paths are stored as;
+            float32 halves the bytes written and read with no visible loss for prices
         
     Returns:
         dict: Paths to saved files
     """
     # Ensure output directory exists
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
     
-    # Save paths data as CSV only if save_full_paths is True
-    paths_file = os.path.join(output_dir, f"{ticker}_paths.csv")
-    if save_full_paths:
-        pd.DataFrame(simulation_paths).to_csv(paths_file, index=False)
+    if file_format == 'parquet' and not has_pyarrow:
+        print("Warning: pyarrow is not installed, saving paths as .npy instead of Parquet")
+        file_format = 'npy'
     
-    # Save statistics as JSON
-    stats_file = os.path.join(output_dir, f"{ticker}_stats.json")
-    with open(stats_file, 'w') as f:
-        json.dump(statistics, f, cls=NumpyEncoder, indent=2)
+    # Cast and make C-contiguous in a single pass up front, so every writer
+    # streams rows sequentially; a no-op for contiguous paths already in this dtype
+    simulation_paths = np.ascontiguousarray(simulation_paths, dtype=dtype)
     
-    # Save a sample of paths for quicker loading
-    sample_paths = simulation_paths[np.random.choice(simulation_paths.shape[0], 
-                                                   min(100, simulation_paths.shape[0]), 
-                                                   replace=False)]
-    sample_file = os.path.join(output_dir, f"{ticker}_sample_paths.csv")
-    pd.DataFrame(sample_paths).to_csv(sample_file, index=False)
+    # Pick a sample of paths for quicker loading; Generator.choice draws the
+    # rows without permuting every path index first
+    n_paths = simulation_paths.shape[0]
+    sample_idx = np.sort(np.random.default_rng().choice(n_paths, min(100, n_paths),
+                                                        replace=False, shuffle=False))
     
+    # Exactly one paths file is written: the full matrix, or only the sample
+    # when full paths are not kept. In the first case the sample is a subset of
+    # the saved rows, so just its indices are stored with the statistics
     if save_full_paths:
-        print(f"Saved simulation data for {ticker} to:")
-        print(f"  - Paths: {paths_file}")
-        print(f"  - Statistics: {stats_file}")
-        print(f"  - Sample paths: {sample_file}")
+        rows, kind, name = simulation_paths, 'paths', f"{ticker}_paths"
+        statistics = {**statistics, 'sample_indices': sample_idx.tolist()}
     else:
-        print(f"Saved simulation data for {ticker} (without full paths) to:")
-        print(f"  - Statistics: {stats_file}")
-        print(f"  - Sample paths: {sample_file}")
+        rows, kind, name = simulation_paths[sample_idx], 'sample', f"{ticker}_sample_paths"
+    saved_files = {'paths': None, 'sample': None}
+    saved_files[kind] = _write_paths_file(rows, os.path.join(output_dir, name), file_format)
+    _remove_stale_paths_files(ticker, output_dir, saved_files[kind])
+    
+    # Save statistics as JSON
+    saved_files['stats'] = os.path.join(output_dir, f"{ticker}_stats.json")
+    _write_stats_file(statistics, saved_files['stats'])
     
-    return {
-        'paths': paths_file if save_full_paths else None,
-        'stats': stats_file,
-        'sample': sample_file
-    }
+    print(f"Saved simulation data for {ticker} to:")
+    print(f"  - {'Paths' if save_full_paths else 'Sample paths'}: {saved_files[kind]}")
+    print(f"  - Statistics: {saved_files['stats']}")
+    
+    return saved_files
+
+
+def save_simulation_data_async(ticker, simulation_paths, statistics, output_dir, **kwargs):
+    """
+    Save simulation data on a background thread.
+    
+    Lets the caller continue with the next simulation while the files are
+    written. The paths and statistics must not be modified until the returned
+    future is done.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        simulation_paths (numpy.ndarray): Simulation paths
+        statistics (dict): Calculated statistics
+        output_dir (str): Directory to save files
+        **kwargs: Additional arguments passed to save_simulation_data
+        
+    Returns:
+        concurrent.futures.Future: Resolves to the dict of saved file paths
+    """
+    return _writer_pool.submit(save_simulation_data, ticker, simulation_paths, statistics, output_dir, **kwargs)
+
+
+def save_many(items, output_dir, max_workers=None, **kwargs):
+    """
+    Save simulation data for several tickers concurrently.
+    
+    The writes are I/O bound and NumPy releases the GIL while writing, so a
+    thread pool overlaps one ticker's disk writes with another's serialization.
+    
+    Args:
+        items (list): (ticker, simulation_paths, statistics) tuples
+        output_dir (str): Directory to save files
+        max_workers (int, optional): Maximum number of concurrent writers
+            (defaults to the number of CPUs)
+        **kwargs: Additional arguments passed to save_simulation_data
+        
+    Returns:
+        dict: Mapping of ticker to its saved file paths (None on failure)
+    """
+    results = {}
+    if not items:
+        return results
+    
+    max_workers = max_workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as executor:
+        futures = {
+            executor.submit(save_simulation_data, ticker, paths, statistics, output_dir, **kwargs): ticker
+            for ticker, paths, statistics in items
+        }
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                results[ticker] = future.result()
+            except Exception as e:
+                print(f"Error saving simulation data for {ticker}: {e}")
+                results[ticker] = None
+    
+    return results
 
 
-def load_simulation_data(ticker, data_dir):
+def index_data_dir(data_dir):
+    """
+    List a data directory once, for repeated existence checks while loading.
+    
+    Args:
+        data_dir (str): Directory containing saved data
+        
+    Returns:
+        dict: Mapping of file name to its os.DirEntry
+    """
+    with os.scandir(data_dir) as entries:
+        return {entry.name: entry for entry in entries}
+
+
+def _file_exists(file_path, dir_index=None):
+    """Check a file against a directory index when given, otherwise with a stat call."""
+    if dir_index is None:
+        return os.path.exists(file_path)
+    return os.path.basename(file_path) in dir_index
+
+
+def _load_paths_file(base_path, mmap_mode=None, dir_index=None):
+    """
+    Load a paths matrix from whichever supported format exists on disk.
+    
+    Args:
+        base_path (str): File path without extension
+        mmap_mode (str, optional): Memory-map mode used for .npy files (e.g. 'r')
+        dir_index (dict, optional): Directory index from index_data_dir
+        
+    Returns:
+        numpy.ndarray: Loaded paths, or None if no paths file exists
+    """
+    for ext in PATHS_EXTENSIONS:
+        file_path = base_path + ext
+        if not _file_exists(file_path, dir_index):
+            continue
+        if ext == ".npy":
+            return np.load(file_path, mmap_mode=mmap_mode, allow_pickle=False)
+        if ext == ".parquet":
+            return pd.read_parquet(file_path).values
+        # Compression is inferred from the extension by both readers
+        if has_pyarrow:
+            table = pa_csv.read_csv(file_path, read_options=pa_csv.ReadOptions(use_threads=True,
+                                                                               block_size=1 << 20))
+            return np.column_stack([column.to_numpy() for column in table.columns])
+        # The file is a plain numeric matrix under an integer header, so parse it
+        # straight into an ndarray without building a DataFrame
+        return np.loadtxt(file_path, delimiter=',', skiprows=1, ndmin=2)
+    return None
+
+
+def load_simulation_data(ticker, data_dir, mmap_mode=None, sample=False, dir_index=None):
     """
     Load saved simulation data.
     
+    Binary .npy paths can be memory-mapped with mmap_mode='r', so loading is
+    nearly free and only the rows that are actually accessed are read from disk.
+    
     Args:
         ticker (str): Stock ticker symbol
         data_dir (str): Directory containing saved data
+        mmap_mode (str, optional): Memory-map mode for .npy paths files (e.g. 'r');
+            None reads the whole matrix into memory
+        sample (bool): Whether to return only the saved sample of paths
+        dir_index (dict, optional): Index of data_dir from index_data_dir; when
+            loading many tickers, build it once so file lookups need no stat calls
         
     Returns:
         tuple: (simulation_paths, statistics)
     """
-    # Construct file paths
-    paths_file = os.path.join(data_dir, f"{ticker}_paths.csv")
+    # Construct file paths (paths files without extension, see _load_paths_file)
+    paths_file = os.path.join(data_dir, f"{ticker}_paths")
     stats_file = os.path.join(data_dir, f"{ticker}_stats.json")
-    sample_file = os.path.join(data_dir, f"{ticker}_sample_paths.csv")
+    sample_file = os.path.join(data_dir, f"{ticker}_sample_paths")
     
     # Check if files exist
-    if not os.path.exists(stats_file):
+    if not _file_exists(stats_file, dir_index):
         print(f"Data files for {ticker} not found in {data_dir}")
         return None, None
     
-    # Load paths data if available, otherwise use sample
-    if os.path.exists(paths_file):
-        simulation_paths = pd.read_csv(paths_file).values
-    elif os.path.exists(sample_file):
-        simulation_paths = pd.read_csv(sample_file).values
-        print(f"Warning: Using sample paths for {ticker}, full paths not available.")
-    else:
-        print(f"No path data available for {ticker}")
-        simulation_paths = None
-    
     # Load statistics
     with open(stats_file, 'r') as f:
         statistics = json.load(f)
     
+    # Load paths data if available, otherwise use sample
+    simulation_paths = _load_paths_file(paths_file, mmap_mode, dir_index)
+    if simulation_paths is not None:
+        if sample and 'sample_indices' in statistics:
+            simulation_paths = simulation_paths[np.asarray(statistics['sample_indices'])]
+    else:
+        simulation_paths = _load_paths_file(sample_file, mmap_mode, dir_index)
+        if simulation_paths is not None:
+            if not sample:
+                print(f"Warning: Using sample paths for {ticker}, full paths not available.")
+        else:
+            print(f"No path data available for {ticker}")
+    
     return simulation_paths, statistics
 
 
+def _materialize_sample(ticker, data_dir):
+    """
+    Write a ticker's sample paths file from its full paths before they are deleted.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        data_dir (str): Directory containing saved data
+    """
+    stats_file = os.path.join(data_dir, f"{ticker}_stats.json")
+    sample_base = os.path.join(data_dir, f"{ticker}_sample_paths")
+    if not os.path.exists(stats_file) or any(os.path.exists(sample_base + ext) for ext in PATHS_EXTENSIONS):
+        return
+    
+    try:
+        with open(stats_file, 'r') as f:
+            sample_indices = json.load(f).get('sample_indices')
+        if sample_indices:
+            paths = _load_paths_file(os.path.join(data_dir, f"{ticker}_paths"), mmap_mode='r')
+            _write_paths_file(np.asarray(paths[np.asarray(sample_indices)]), sample_base, 'npy')
+    except Exception as e:
+        print(f"Error saving sample paths for {ticker}: {e}")
+
+
 def cleanup_raw_data(ticker=None, data_dir=None):
     """
     Delete raw path data files to save disk space after analysis is complete.
     
+    Samples stored as indices into the full paths are written out to their
+    own sample file first, so they remain loadable.
+    
     Args:
         ticker (str, optional): Specific ticker to clean up. If None, clean all tickers.
         data_dir (str): Directory containing saved data
@@ -134,22 +482,30 @@ def cleanup_raw_data(ticker=None, data_dir=None):
     deleted_count = 0
     
     if ticker:
-        # Delete specific ticker's paths file
-        paths_file = os.path.join(data_dir, f"{ticker}_paths.csv")
-        if os.path.exists(paths_file):
-            os.remove(paths_file)
-            deleted_count += 1
-            print(f"Deleted raw data file: {paths_file}")
+        # Delete specific ticker's paths file in any supported format
+        for ext in PATHS_EXTENSIONS:
+            paths_file = os.path.join(data_dir, f"{ticker}_paths{ext}")
+            if os.path.exists(paths_file):
+                _materialize_sample(ticker, data_dir)
+                os.remove(paths_file)
+                deleted_count += 1
+                print(f"Deleted raw data file: {paths_file}")
     else:
         # Delete all paths files in the directory
-        for filename in os.listdir(data_dir):
-            if filename.endswith("_paths.csv") and not filename.endswith("_sample_paths.csv"):
-                file_path = os.path.join(data_dir, filename)
-                try:
-                    os.remove(file_path)
-                    deleted_count += 1
-                except Exception as e:
-                    print(f"Error deleting {file_path}: {e}")
+        sample_suffixes = tuple("_sample_paths" + ext for ext in PATHS_EXTENSIONS)
+        with os.scandir(data_dir) as entries:
+            for entry in entries:
+                filename = entry.name
+                if filename.endswith(sample_suffixes):
+                    continue
+                suffix = next((f"_paths{ext}" for ext in PATHS_EXTENSIONS if filename.endswith(f"_paths{ext}")), None)
+                if suffix:
+                    try:
+                        _materialize_sample(filename[:-len(suffix)], data_dir)
+                        os.remove(entry.path)
+                        deleted_count += 1
+                    except Exception as e:
+                        print(f"Error deleting {entry.path}: {e}")
     
     print(f"Cleanup complete. Deleted {deleted_count} raw data files.")
     return deleted_count 
\ No newline at end of file
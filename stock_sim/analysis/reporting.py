@@ -7,35 +7,664 @@ Generate HTML reports for simulation results.
 """
 
 import os
+import bisect
+import collections
+import hashlib
 import json
+import math
+import shutil
+import contextlib
 import datetime
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import jinja2
+import numpy as np
 import pandas as pd
 
 
+# Directory holding the Jinja2 report templates
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+STOCK_REPORT_TEMPLATE = "stock_report_template.html"
+BATCH_REPORT_TEMPLATE = "batch_report_template.html"
+
+# Jinja2 environments per template directory, each caching its compiled templates
+_TEMPLATE_ENVS = {}
+
+# Directory for the compiled template bytecode shared between processes;
+# None uses a per-user directory in the system temporary directory
+TEMPLATE_CACHE_DIR = None
+
+# Write buffer for report files
+REPORT_BUFFER_SIZE = 1 << 16
+
+# Stands in for the generation time in rendered reports, so cached bodies can
+# be reused later; replaced by the actual time whenever a report is written
+_GENERATED_ON_MARK = "@@GENERATED_ON@@"
+
+# Static files (stylesheets and script) shared by the reports, and the
+# directory, relative to the report directory, they are copied to
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+REPORT_ASSETS = ("report.css", "report.js", "batch_report.css")
+REPORT_ASSETS_DIR = "assets"
+
+# Report asset directories already written or checked in this process
+_WRITTEN_ASSETS = set()
+
+# Most recently rendered reports, mapping a hash of their inputs to the
+# rendered body (without the generation time), and the number of entries kept
+_RENDER_CACHE = collections.OrderedDict()
+RENDER_CACHE_SIZE = 32
+
+# Fraction of rendered reports admitted to the cache, overridable
+# through REPORT_CACHE_P; most reports are one-off, so only some are kept
+RENDER_CACHE_P_ENV = "REPORT_CACHE_P"
+RENDER_CACHE_P = 0.3
+
+# Running sum deciding which rendered reports are admitted
+_render_cache_acc = 0.0
+
+# Guards the render cache and its admission sum, which the report threads of
+# the web server share
+_RENDER_CACHE_LOCK = threading.Lock()
+
+def _old_reports(output_dir, ticker):
+    """
+    List the existing report paths for a ticker.
+    
+    The directory is scanned on every call, since other processes (report
+    workers, the CLI and the web server) write reports to it as well.
+    
+    Args:
+        output_dir (str): Directory containing the reports
+        ticker (str): Stock ticker symbol
+        
+    Returns:
+        list: Paths of the ticker's reports in the directory
+    """
+    prefix = f"{ticker}_report_"
+    with os.scandir(output_dir) as it:
+        return [entry.path for entry in it
+                if entry.name.startswith(prefix) and entry.name.endswith(".html")]
+
+
+def _remove_files(paths):
+    """
+    Delete a batch of files, reporting failures once for the whole batch.
+    
+    Args:
+        paths (list): Paths of the files to delete
+        
+    Returns:
+        int: Number of files actually deleted
+    """
+    deleted = 0
+    failed = []
+    for path in paths:
+        try:
+            os.remove(path)
+            deleted += 1
+        except FileNotFoundError:
+            pass  # Already removed by another process
+        except OSError:
+            failed.append(os.path.basename(path))
+    if failed:
+        print(f"Warning: Could not delete {len(failed)} old report(s): {', '.join(failed)}")
+    return deleted
+
+
+# Interpretation scales for the report metrics: ascending thresholds and one
+# more label than thresholds, from the lowest band to the highest. A value
+# equal to a threshold falls into the band below it.
+_PCT_RETURN_SCALE = (
+    (-15, -5, 5, 15),
+    (
+        'Strong Sell Signal',
+        'Sell Signal',
+        'Hold Signal',
+        'Buy Signal',
+        'Strong Buy Signal',
+    ),
+)
+_RETURN_VOLATILITY_SCALE = (
+    (10, 20, 30),
+    (
+        'Low Risk',
+        'Moderate Risk',
+        'High Risk',
+        'Very High Risk',
+    ),
+)
+_SHARPE_RATIO_SCALE = (
+    (0.5, 1, 1.5),
+    (
+        'Poor Risk-Adjusted Returns',
+        'Fair Risk-Adjusted Returns',
+        'Good Risk-Adjusted Returns',
+        'Excellent Risk-Adjusted Returns',
+    ),
+)
+_SORTINO_RATIO_SCALE = (
+    (0.5, 1, 2),
+    (
+        'Poor Downside Protection',
+        'Fair Downside Protection',
+        'Good Downside Protection',
+        'Excellent Downside Protection',
+    ),
+)
+_VAR_95_SCALE = (
+    (10, 15, 20),
+    (
+        'Low Risk',
+        'Moderate Risk',
+        'High Risk',
+        'Very High Risk',
+    ),
+)
+# -0.1 itself is still 'Symmetric' (|skewness| <= 0.1), so the band starts
+# at the next float below it
+_SKEWNESS_SCALE = (
+    (-0.5, math.nextafter(-0.1, -math.inf), 0.1, 0.5),
+    (
+        'Strong Negative Skew (Downside Risk)',
+        'Slight Negative Skew',
+        'Symmetric',
+        'Slight Positive Skew',
+        'Strong Positive Skew (Upside Potential)',
+    ),
+)
+_MAX_DRAWDOWN_SCALE = (
+    (10, 20, 30),
+    (
+        'Low Risk',
+        'Moderate Risk',
+        'High Risk',
+        'Extreme Risk',
+    ),
+)
+_KURTOSIS_SCALE = (
+    (2, 3, 5),
+    (
+        'Low Tail Risk',
+        'Normal Tail Risk',
+        'High Tail Risk',
+        'Very High Tail Risk',
+    ),
+)
+_TREYNOR_RATIO_SCALE = (
+    (0.05, 0.10, 0.15),
+    (
+        'Poor',
+        'Fair',
+        'Good',
+        'Excellent',
+    ),
+)
+_INFORMATION_RATIO_SCALE = (
+    (0, 0.5, 1.0),
+    (
+        'Underperforming',
+        'Average',
+        'Good',
+        'Superior',
+    ),
+)
+_BETA_SCALE = (
+    (0.5, 0.8, 1.2, 1.5),
+    (
+        'Very Defensive',
+        'Defensive',
+        'Moderate',
+        'Aggressive',
+        'Highly Aggressive',
+    ),
+)
+_RSI_14_SCALE = (
+    (20, 30, 70, 80),
+    (
+        'Strongly Oversold',
+        'Oversold',
+        'Neutral',
+        'Overbought',
+        'Strongly Overbought',
+    ),
+)
+_HURST_EXPONENT_SCALE = (
+    (0.35, 0.45, 0.55, 0.65),
+    (
+        'Strong Mean-Reversion',
+        'Weak Mean-Reversion',
+        'Random Walk',
+        'Weak Trend-Following',
+        'Strong Trend-Following',
+    ),
+)
+
+
+def _interpret(value, scale):
+    """
+    Look up the interpretation label for a metric value.
+    
+    Args:
+        value (float): Metric value
+        scale (tuple): (thresholds, labels) pair for the metric
+        
+    Returns:
+        str: Label of the band the value falls into
+    """
+    thresholds, labels = scale
+    return labels[bisect.bisect_left(thresholds, value)]
+
+
+def _template_stamp(name):
+    """Return the modification time and size of a template, which change when it is edited."""
+    try:
+        st = os.stat(os.path.join(TEMPLATE_DIR, name))
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _report_cache_key(ticker, model_type, stats, num_paths):
+    """
+    Hash the inputs that determine the content of a stock report.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        model_type (str): Model type shown in the report
+        stats (dict): Statistics rendered in the report
+        num_paths (int): Number of simulated paths
+        
+    Returns:
+        str: Hex digest identifying the rendered report
+    """
+    payload = json.dumps([TEMPLATE_DIR, _template_stamp(STOCK_REPORT_TEMPLATE),
+                          ticker, model_type, num_paths, stats],
+                         sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _write_report(report_path, body, generated_on):
+    """
+    Write a rendered report, filling in its generation time.
+    
+    Args:
+        report_path (str): Path of the report
+        body (str): Rendered report, with _GENERATED_ON_MARK for the generation time
+        generated_on (str): Formatted generation time
+        
+    Raises:
+        OSError: If the report cannot be written
+    """
+    with atomic_open(report_path, buffering=REPORT_BUFFER_SIZE) as f:
+        f.write(body.replace(_GENERATED_ON_MARK, generated_on))
+
+
+def _stream_report(report_path, chunks, generated_on, keep=False):
+    """
+    Write a report to disk as the template produces it, filling in its generation time.
+    
+    Args:
+        report_path (str): Path of the report
+        chunks (iterable): Rendered pieces of the report, with
+            _GENERATED_ON_MARK for the generation time
+        generated_on (str): Formatted generation time
+        keep (bool): Whether to also return the whole rendered report
+        
+    Returns:
+        str: Rendered report with _GENERATED_ON_MARK if keep is set, otherwise None
+        
+    Raises:
+        OSError: If the report cannot be written
+    """
+    kept = [] if keep else None
+    with atomic_open(report_path, buffering=REPORT_BUFFER_SIZE) as f:
+        for chunk in chunks:
+            if kept is not None:
+                kept.append(chunk)
+            f.write(chunk.replace(_GENERATED_ON_MARK, generated_on))
+    return "".join(kept) if keep else None
+
+
+def _batch_report_cache_key(tickers, ticker, model_params, stats, num_paths):
+    """
+    Hash the inputs that determine the content of a batch report.
+    
+    Args:
+        tickers (list): Tickers listed in the report
+        ticker (str): Ticker whose simulation is detailed in the report
+        model_params (dict): Model parameters of that simulation
+        stats (dict): Statistics of that simulation
+        num_paths (int): Number of simulated paths
+        
+    Returns:
+        str: Hex digest identifying the rendered report
+    """
+    payload = json.dumps([TEMPLATE_DIR, _template_stamp(BATCH_REPORT_TEMPLATE), tickers, ticker,
+                          model_params, num_paths, stats],
+                         sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _render_cache_get(key):
+    """
+    Look up a previously rendered report.
+    
+    Args:
+        key (str): Hash of the report inputs
+        
+    Returns:
+        str: Rendered report body, or None if it is not cached
+    """
+    with _RENDER_CACHE_LOCK:
+        body = _RENDER_CACHE.get(key)
+        if body is not None:
+            _RENDER_CACHE.move_to_end(key)
+    return body
+
+
+def _render_cache_admission():
+    """Return the fraction of rendered reports admitted to the render cache."""
+    try:
+        p = float(os.environ.get(RENDER_CACHE_P_ENV, RENDER_CACHE_P))
+    except ValueError:
+        print(f"Warning: Invalid {RENDER_CACHE_P_ENV} value, using {RENDER_CACHE_P}")
+        p = RENDER_CACHE_P
+    return min(max(p, 0.0), 1.0)
+
+
+def _render_cache_admit():
+    """
+    Decide whether the report about to be rendered is admitted to the cache.
+    
+    The admission probability is added to an accumulator on every call and a
+    report is admitted each time it reaches one, which spreads the admitted
+    reports evenly without drawing random numbers.
+    
+    Returns:
+        bool: Whether the report should be stored with _render_cache_put
+    """
+    global _render_cache_acc
+    p = _render_cache_admission()
+    with _RENDER_CACHE_LOCK:
+        _render_cache_acc += p
+        if _render_cache_acc < 1.0:
+            return False
+        _render_cache_acc -= 1.0
+        return True
+
+
+def _render_cache_put(key, body):
+    """
+    Remember a rendered report, evicting the least recently used.
+    
+    Args:
+        key (str): Hash of the report inputs
+        body (str): Rendered report, with _GENERATED_ON_MARK for the generation time
+    """
+    with _RENDER_CACHE_LOCK:
+        _RENDER_CACHE[key] = body
+        _RENDER_CACHE.move_to_end(key)
+        while len(_RENDER_CACHE) > RENDER_CACHE_SIZE:
+            _RENDER_CACHE.popitem(last=False)
+
+
+def _temp_name(path):
+    """Return a temporary file name next to path that no other writer uses."""
+    return f"{path}.{uuid.uuid4().hex}.tmp"
+
+
+def _temp_file(path):
+    """
+    Create an empty temporary file next to path.
+    
+    The file is created exclusively under a unique name, so it is never a
+    file left behind by another writer (or a link to one).
+    
+    Args:
+        path (str): Final path of the file
+        
+    Returns:
+        str: Path of the temporary file
+        
+    Raises:
+        OSError: If the file cannot be created
+    """
+    tmp_path = _temp_name(path)
+    os.close(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+    return tmp_path
+
+
+@contextlib.contextmanager
+def atomic_open(path, buffering=-1):
+    """
+    Open a temporary file for writing that replaces path once it is complete.
+    
+    Readers never see a partially written file, and concurrent writers of
+    the same path, in other processes or threads, each write their own
+    temporary file.
+    
+    Args:
+        path (str): Final path of the file
+        buffering (int): Buffer size passed to open
+        
+    Yields:
+        file: Text file object to write the content to
+        
+    Raises:
+        OSError: If the temporary file cannot be created or moved into place
+    """
+    tmp_path = _temp_file(path)
+    try:
+        with open(tmp_path, 'w', buffering=buffering) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _copy_into_place(source, target):
+    """
+    Replace target with a copy of source, written under a temporary name first.
+    
+    Args:
+        source (str): Path of the existing file
+        target (str): Path of the copy
+        
+    Raises:
+        OSError: If the file cannot be copied
+    """
+    tmp_path = _temp_file(target)
+    try:
+        shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _link_or_copy(source, target):
+    """
+    Replace target with a hard link to source, copying where links fail.
+    
+    Both paths then share one file, so anything else writing target must
+    replace it (as atomic_open does) rather than write into it.
+    
+    Args:
+        source (str): Path of the existing file
+        target (str): Path the file should also be available at
+        
+    Raises:
+        OSError: If the file can neither be linked nor copied
+    """
+    tmp_path = _temp_name(target)
+    try:
+        os.link(source, tmp_path)
+    except FileExistsError:
+        raise
+    except OSError:
+        # Hard links are not supported on every file system (e.g. FAT)
+        _copy_into_place(source, target)
+        return
+    try:
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _ensure_assets(output_dir):
+    """
+    Copy the static files shared by the reports into the report directory.
+    
+    A file is only copied when it is missing or older than its source, and
+    each directory is checked at most once per process.
+    
+    Args:
+        output_dir (str): Directory the reports are written to
+        
+    Returns:
+        str: Directory of the static files relative to the reports
+    """
+    assets_dir = os.path.join(output_dir, REPORT_ASSETS_DIR)
+    if assets_dir not in _WRITTEN_ASSETS:
+        os.makedirs(assets_dir, exist_ok=True)
+        for name in REPORT_ASSETS:
+            source = os.path.join(STATIC_DIR, name)
+            target = os.path.join(assets_dir, name)
+            try:
+                if os.stat(target).st_mtime >= os.stat(source).st_mtime:
+                    continue
+            except OSError:
+                pass
+            try:
+                _copy_into_place(source, target)
+            except OSError as e:
+                print(f"Warning: Could not copy report asset {name} to {assets_dir}: {e}")
+        _WRITTEN_ASSETS.add(assets_dir)
+    return REPORT_ASSETS_DIR
+
+
+def _get_template(name):
+    """
+    Get a report template from TEMPLATE_DIR.
+    
+    Templates are compiled to Python code once per template directory and
+    then reused by every report. The compiled code is also kept in an
+    on-disk bytecode cache, so report worker processes and later runs load
+    it instead of parsing the templates again.
+    
+    Args:
+        name (str): File name of the template
+        
+    Returns:
+        jinja2.Template: Compiled template
+    """
+    env = _TEMPLATE_ENVS.get(TEMPLATE_DIR)
+    if env is None:
+        try:
+            bytecode_cache = jinja2.FileSystemBytecodeCache(TEMPLATE_CACHE_DIR)
+        except (OSError, RuntimeError) as e:
+            print(f"Warning: Template bytecode cache disabled: {e}")
+            bytecode_cache = None
+        env = jinja2.Environment(
+            loader=jinja2.FileSystemLoader(TEMPLATE_DIR),
+            autoescape=jinja2.select_autoescape(['html']),
+            trim_blocks=True,
+            lstrip_blocks=True,
+            keep_trailing_newline=True,
+            auto_reload=False,
+            bytecode_cache=bytecode_cache,
+        )
+        _TEMPLATE_ENVS[TEMPLATE_DIR] = env
+    return env.get_template(name)
+
+
+# Percentile levels, labels and interpretations of the price distribution
+# table rows
+_PERCENTILE_LEVELS = np.array([5, 25, 50, 75, 95])
+_PERCENTILE_LABELS = ('5%', '25%', '50% (Median)', '75%', '95%')
+_PERCENTILE_DESCRIPTIONS = (
+    'Worst-case scenario (95% confidence)',
+    'Lower quartile',
+    'Most likely scenario',
+    'Upper quartile',
+    'Best-case scenario (95% confidence)',
+)
+
+
+def _percentile_rows(percentiles, initial_price, paths_matrix=None):
+    """
+    Compute the rows of the price distribution table.
+    
+    Prices and returns for all rows are computed as arrays in one go; the
+    percentiles are taken from the final prices in the paths matrix only when
+    the statistics do not already provide them.
+    
+    Args:
+        percentiles (dict): Final price percentiles keyed like '5%'
+        initial_price (float): Price the returns are measured against
+        paths_matrix (numpy.ndarray, optional): Simulated paths of shape (paths, steps+1)
+        
+    Returns:
+        list: Dictionaries with the formatted values of each table row
+    """
+    if not percentiles and paths_matrix is not None:
+        prices = np.percentile(paths_matrix[:, -1], _PERCENTILE_LEVELS)
+    else:
+        prices = np.array([percentiles.get(f"{level}%", 0) for level in _PERCENTILE_LEVELS],
+                          dtype=float)
+    if initial_price > 0:
+        pct_returns = (prices / initial_price - 1) * 100
+    else:
+        pct_returns = np.zeros_like(prices)
+    css_classes = np.where(pct_returns >= 0, 'positive', 'negative')
+    return [
+        {
+            'label': label,
+            'price': f"{price:.2f}",
+            'css_class': css_class,
+            'pct_return': f"{pct_return:.2f}",
+            'description': description,
+        }
+        for label, price, pct_return, css_class, description in zip(
+            _PERCENTILE_LABELS, prices.tolist(), pct_returns.tolist(),
+            css_classes.tolist(), _PERCENTILE_DESCRIPTIONS)
+    ]
+
+
 def generate_stock_report(ticker, result, output_dir):
     """
     Generate an HTML report for a single stock simulation.
     
     Args:
         ticker (str): Stock ticker symbol
-        result (dict): Simulation result dictionary
+        result (dict): Simulation result dictionary; 'num_paths' is used for the
+            path count when present, so 'paths_matrix' can be left out
         output_dir (str): Directory to save report
         
     Returns:
         str: Path to the generated report
     """
     # Ensure output directory exists
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
     
     # Delete old reports for this ticker
-    for old_report in os.listdir(output_dir):
-        if old_report.startswith(f"{ticker}_report_") and old_report.endswith(".html"):
-            try:
-                os.remove(os.path.join(output_dir, old_report))
-                print(f"Deleted old report: {old_report}")
-            except Exception as e:
-                print(f"Warning: Could not delete old report {old_report}: {e}")
+    old_reports = _old_reports(output_dir, ticker)
+    if old_reports:
+        deleted = _remove_files(old_reports)
+        print(f"Deleted {deleted} old report(s) for {ticker}")
     
     # Extract data from result
     if not result or 'statistics' not in result:
@@ -43,19 +672,20 @@ def generate_stock_report(ticker, result, output_dir):
         return None
     
     stats = result['statistics']
+    assets_dir = _ensure_assets(output_dir)
     
-    # Get actual number of paths from the paths matrix if available
+    # Get actual number of paths, preferably as passed in by the caller so the
+    # paths matrix does not have to be shipped along with the result
     paths_matrix = result.get('paths_matrix', None)
-    if paths_matrix is not None:
-        num_paths = paths_matrix.shape[0]
+    if 'num_paths' in result:
+        num_paths = result['num_paths']
+    elif paths_matrix is not None:
+        num_paths = len(paths_matrix)
     elif 'simulation_config' in result:
         num_paths = result['simulation_config'].get('paths', 1000)
     else:
         num_paths = stats.get('num_paths', 1000)
     
-    # Ensure num_paths is set in stats
-    stats['num_paths'] = num_paths
-    
     # Format paths for HTML
     graphs = result.get('graphs', {})
     paths_graph = f"../graphs/{ticker}_price_paths.png"
@@ -66,763 +696,231 @@ def generate_stock_report(ticker, result, output_dir):
     risk_reward_graph = f"../graphs/{ticker}_risk_reward.png"
     yearly_returns_graph = f"../graphs/{ticker}_yearly_returns.png"
     
-    # Generate report filename with timestamp
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    # Generate report filename with timestamp; the same time is shown in the header
+    now = datetime.datetime.now()
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
     report_filename = f"{ticker}_report_{timestamp}.html"
     report_path = os.path.join(output_dir, report_filename)
     
-    # Helper function to format values with colors based on positive/negative
-    def color_format(value, is_percent=False, reverse=False):
-        """Format values with color coding"""
-        if not isinstance(value, (int, float)):
-            return value
-        
-        # Determine if positive or negative (or zero)
-        if value > 0:
-            color_class = "negative" if reverse else "positive"
-        elif value < 0:
-            color_class = "positive" if reverse else "negative"
-        else:
-            color_class = "neutral"
-        
-        # Format the value
-        if is_percent:
-            formatted = f"{value:.2f}%"
-        else:
-            formatted = f"{value:.2f}"
-        
-        return f"<span class='{color_class}'>{formatted}</span>"
+    generated_on = now.strftime("%Y-%m-%d %H:%M:%S")
+    
+    # Reuse an identical report rendered earlier in this process if there is
+    # one. The cache is skipped when the percentile table has to be computed
+    # from the paths matrix, which is not part of the cache key
+    model_type = result.get('model_type', 'combined')
+    cache_key = None
+    if stats.get('percentiles') or paths_matrix is None:
+        cache_key = _report_cache_key(ticker, model_type, stats, num_paths)
+        body = _render_cache_get(cache_key)
+        if body is not None:
+            try:
+                _write_report(report_path, body, generated_on)
+            except OSError as e:
+                print(f"Error: Could not write report for {ticker}: {e}")
+                return None
+            print(f"Reused cached report for {ticker}: {report_path}")
+            return report_path
     
     # Get summary statistics
     initial_price = stats.get('initial_price', 0)
     mean_final_price = stats.get('mean_final_price', 0)
     pct_return = ((mean_final_price / initial_price) - 1) * 100 if initial_price > 0 else 0
     
-    # HTML Template with improved styling and interactivity
-    html_content = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{ticker} Stock Price Simulation</title>
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            margin: 0;
-            padding: 20px;
-            color: #333;
-            line-height: 1.6;
-        }}
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: white;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            border-radius: 8px;
-        }}
-        h1, h2, h3 {{
-            color: #2c3e50;
-        }}
-        .header {{
-            text-align: center;
-            margin-bottom: 20px;
-            padding-bottom: 10px;
-            border-bottom: 1px solid #eee;
-        }}
-        .section {{
-            margin-bottom: 30px;
-        }}
-        .metrics {{
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(250px, 1fr));
-            gap: 15px;
-            margin-bottom: 30px;
-        }}
-        .metric-box {{
-            background-color: #f8f9fa;
-            padding: 15px;
-            border-radius: 6px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-            position: relative;
-        }}
-        .metric-box h3 {{
-            margin-top: 0;
-            margin-bottom: 10px;
-            font-size: 16px;
-            color: #2c3e50;
-        }}
-        .metric-box p {{
-            margin: 0;
-            font-size: 18px;
-            font-weight: bold;
-        }}
-        .positive {{
-            color: #28a745;
-        }}
-        .negative {{
-            color: #dc3545;
-        }}
-        .neutral {{
-            color: #6c757d;
-        }}
-        .percentiles {{
-            margin-bottom: 20px;
-        }}
-        .percentiles table, .stats-table {{
-            width: 100%;
-            border-collapse: collapse;
-        }}
-        .percentiles th, .percentiles td, .stats-table th, .stats-table td {{
-            text-align: left;
-            padding: 8px;
-            border-bottom: 1px solid #ddd;
-        }}
-        .percentiles th, .stats-table th {{
-            background-color: #f2f2f2;
-        }}
-        .image-section {{
-            margin-top: 40px;
-        }}
-        .image-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(500px, 1fr));
-            gap: 20px;
-        }}
-        .image-container {{
-            text-align: center;
-            margin-bottom: 30px;
-            cursor: pointer;
-            transition: transform 0.3s ease;
-        }}
-        .image-container:hover {{
-            transform: scale(1.02);
-        }}
-        img {{
-            max-width: 100%;
-            height: auto;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            border-radius: 4px;
-        }}
-        .footer {{
-            text-align: center;
-            margin-top: 40px;
-            font-size: 14px;
-            color: #6c757d;
-        }}
-        .tooltip {{
-            position: relative;
-            display: inline-block;
-            cursor: help;
-        }}
-        .tooltip .tooltip-text {{
-            visibility: hidden;
-            width: 300px;
-            background-color: #2c3e50;
-            color: #fff;
-            text-align: left;
-            border-radius: 6px;
-            padding: 10px;
-            position: absolute;
-            z-index: 1;
-            bottom: 125%;
-            left: 50%;
-            margin-left: -150px;
-            opacity: 0;
-            transition: opacity 0.3s;
-            font-size: 14px;
-            line-height: 1.4;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.2);
-        }}
-        .tooltip:hover .tooltip-text {{
-            visibility: visible;
-            opacity: 1;
-        }}
-        .modal {{
-            display: none;
-            position: fixed;
-            z-index: 1000;
-            left: 0;
-            top: 0;
-            width: 100%;
-            height: 100%;
-            background-color: rgba(0,0,0,0.9);
-        }}
-        .modal-content {{
-            margin: auto;
-            display: block;
-            width: 90%;
-            max-width: 1200px;
-            max-height: 90vh;
-            object-fit: contain;
-        }}
-        .close {{
-            position: absolute;
-            right: 35px;
-            top: 15px;
-            color: #f1f1f1;
-            font-size: 40px;
-            font-weight: bold;
-            cursor: pointer;
-        }}
-        .simulation-params {{
-            background-color: #f8f9fa;
-            padding: 20px;
-            border-radius: 8px;
-            margin-bottom: 30px;
-        }}
-        .param-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(200px, 1fr));
-            gap: 15px;
-        }}
-        .param-item {{
-            padding: 10px;
-            background-color: white;
-            border-radius: 4px;
-            box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-        }}
-        .market-interpretation {{
-            background-color: #e8f4f8;
-            padding: 15px;
-            border-radius: 6px;
-            margin-top: 10px;
-            font-size: 14px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>{ticker} Stock Price Simulation</h1>
-            <p>Generated on: {datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
-        </div>
-        
-        <div class="simulation-params">
-            <h2>Simulation Parameters</h2>
-            <div class="param-grid">
-                <div class="param-item tooltip">
-                    <strong>Model Type:</strong> {result.get('model_type', 'combined').upper()}
-                    <span class="tooltip-text">The type of stochastic model used for price simulation</span>
-                </div>
-                <div class="param-item tooltip">
-                    <strong>Number of Paths:</strong> {num_paths:,}
-                    <span class="tooltip-text">Number of simulated price paths used in Monte Carlo simulation</span>
-                </div>
-                <div class="param-item tooltip">
-                    <strong>Time Steps:</strong> {stats.get('num_steps', 21)}
-                    <span class="tooltip-text">Number of discrete time points in the simulation</span>
-                </div>
-                <div class="param-item tooltip">
-                    <strong>Time Horizon:</strong> {stats.get('num_steps', 21)} trading days
-                    <span class="tooltip-text">Length of the forecast period in trading days</span>
-                </div>
-                <div class="param-item tooltip">
-                    <strong>Annual Drift (μ):</strong> {stats.get('mu', 0)*100:.2f}%
-                    <span class="tooltip-text">Expected annual return based on historical data</span>
-                </div>
-                <div class="param-item tooltip">
-                    <strong>Annual Volatility (σ):</strong> {stats.get('sigma', 0)*100:.2f}%
-                    <span class="tooltip-text">Annual volatility of returns based on historical data</span>
-                </div>
-            </div>
-        </div>
-        
-        <div class="section">
-            <h2>Summary Statistics</h2>
-            <div class="metrics">
-                <div class="metric-box tooltip">
-                    <h3>Initial Price</h3>
-                    <p>${initial_price:.2f}</p>
-                    <span class="tooltip-text">Current market price used as starting point for simulation</span>
-                    <div class="market-interpretation">
-                        Base price for calculating potential returns
-                    </div>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Expected Final Price</h3>
-                    <p>${mean_final_price:.2f}</p>
-                    <span class="tooltip-text">Average predicted price across all simulation paths</span>
-                    <div class="market-interpretation">
-                        The model's central price forecast
-                    </div>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Expected Return</h3>
-                    <p class="{('positive' if pct_return >= 0 else 'negative')}">{pct_return:.2f}%</p>
-                    <span class="tooltip-text">Average predicted return over the simulation period</span>
-                    <div class="market-interpretation">
-                        {
-                            "Strong Buy Signal" if pct_return > 15 else
-                            "Buy Signal" if pct_return > 5 else
-                            "Hold Signal" if pct_return > -5 else
-                            "Sell Signal" if pct_return > -15 else
-                            "Strong Sell Signal"
-                        }
-                    </div>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Return Volatility</h3>
-                    <p>{stats.get('return_volatility', 0):.2f}%</p>
-                    <span class="tooltip-text">Standard deviation of returns, measuring price uncertainty</span>
-                    <div class="market-interpretation">
-                        {
-                            "Very High Risk" if stats.get('return_volatility', 0) > 30 else
-                            "High Risk" if stats.get('return_volatility', 0) > 20 else
-                            "Moderate Risk" if stats.get('return_volatility', 0) > 10 else
-                            "Low Risk"
-                        }
-                    </div>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Sharpe Ratio</h3>
-                    <p class="{('positive' if stats.get('sharpe_ratio', 0) > 0.5 else 'negative')}">{stats.get('sharpe_ratio', 0):.2f}</p>
-                    <span class="tooltip-text">Risk-adjusted return measure (higher is better)</span>
-                    <div class="market-interpretation">
-                        {
-                            "Excellent Risk-Adjusted Returns" if stats.get('sharpe_ratio', 0) > 1.5 else
-                            "Good Risk-Adjusted Returns" if stats.get('sharpe_ratio', 0) > 1 else
-                            "Fair Risk-Adjusted Returns" if stats.get('sharpe_ratio', 0) > 0.5 else
-                            "Poor Risk-Adjusted Returns"
-                        }
-                    </div>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Sortino Ratio</h3>
-                    <p class="{('positive' if stats.get('sortino_ratio', 0) > 0.5 else 'negative')}">{stats.get('sortino_ratio', 0):.2f}</p>
-                    <span class="tooltip-text">Risk-adjusted return focusing on downside volatility</span>
-                    <div class="market-interpretation">
-                        {
-                            "Excellent Downside Protection" if stats.get('sortino_ratio', 0) > 2 else
-                            "Good Downside Protection" if stats.get('sortino_ratio', 0) > 1 else
-                            "Fair Downside Protection" if stats.get('sortino_ratio', 0) > 0.5 else
-                            "Poor Downside Protection"
-                        }
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <div class="section">
-            <h2>Risk Metrics</h2>
-            <div class="metrics">
-                <div class="metric-box tooltip">
-                    <h3>Value at Risk (95%)</h3>
-                    <p>{stats.get('var_95', 0):.2f}%</p>
-                    <span class="tooltip-text">Maximum expected loss at 95% confidence level</span>
-                    <div class="market-interpretation">
-                        {
-                            "Very High Risk" if stats.get('var_95', 0) > 20 else
-                            "High Risk" if stats.get('var_95', 0) > 15 else
-                            "Moderate Risk" if stats.get('var_95', 0) > 10 else
-                            "Low Risk"
-                        }
-                    </div>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Conditional VaR (95%)</h3>
-                    <p>{stats.get('cvar_95', 0):.2f}%</p>
-                    <span class="tooltip-text">Average loss when losses exceed VaR</span>
-                    <div class="market-interpretation">
-                        Expected loss in worst-case scenarios
-                    </div>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Maximum Drawdown</h3>
-                    <p>{stats.get('max_drawdown', 0)*100:.2f}%</p>
-                    <span class="tooltip-text">Largest peak-to-trough decline</span>
-                    <div class="market-interpretation">
-                        {
-                            "Extreme Risk" if stats.get('max_drawdown', 0)*100 > 30 else
-                            "High Risk" if stats.get('max_drawdown', 0)*100 > 20 else
-                            "Moderate Risk" if stats.get('max_drawdown', 0)*100 > 10 else
-                            "Low Risk"
-                        }
-                    </div>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Skewness</h3>
-                    <p>{stats.get('skewness', 0):.2f}</p>
-                    <span class="tooltip-text">Measure of return distribution asymmetry</span>
-                    <div class="market-interpretation">
-                        {
-                            "Strong Positive Skew (Upside Potential)" if stats.get('skewness', 0) > 0.5 else
-                            "Slight Positive Skew" if stats.get('skewness', 0) > 0.1 else
-                            "Symmetric" if abs(stats.get('skewness', 0)) <= 0.1 else
-                            "Slight Negative Skew" if stats.get('skewness', 0) > -0.5 else
-                            "Strong Negative Skew (Downside Risk)"
-                        }
-                    </div>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Kurtosis</h3>
-                    <p>{stats.get('kurtosis', 0):.2f}</p>
-                    <span class="tooltip-text">Measure of extreme return frequency</span>
-                    <div class="market-interpretation">
-                        {
-                            "Very High Tail Risk" if stats.get('kurtosis', 0) > 5 else
-                            "High Tail Risk" if stats.get('kurtosis', 0) > 3 else
-                            "Normal Tail Risk" if stats.get('kurtosis', 0) > 2 else
-                            "Low Tail Risk"
-                        }
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <div class="section">
-            <h2>Advanced Risk Analytics</h2>
-            <div class="metrics">
-                <div class="metric-box tooltip">
-                    <h3>Treynor Ratio</h3>
-                    <p>{stats.get('treynor_ratio', 0):.4f}</p>
-                    <span class="tooltip-text">Risk-adjusted performance relative to systematic risk (β). Higher values indicate better risk-adjusted returns.</span>
-                    <div class="market-interpretation">
-                        {
-                            "Excellent" if stats.get('treynor_ratio', 0) > 0.15 else
-                            "Good" if stats.get('treynor_ratio', 0) > 0.10 else
-                            "Fair" if stats.get('treynor_ratio', 0) > 0.05 else
-                            "Poor"
-                        }
-                    </div>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Information Ratio</h3>
-                    <p>{stats.get('information_ratio', 0):.4f}</p>
-                    <span class="tooltip-text">Measures risk-adjusted excess returns relative to benchmark. Higher values indicate better active management.</span>
-                    <div class="market-interpretation">
-                        {
-                            "Superior" if stats.get('information_ratio', 0) > 1.0 else
-                            "Good" if stats.get('information_ratio', 0) > 0.5 else
-                            "Average" if stats.get('information_ratio', 0) > 0 else
-                            "Underperforming"
-                        }
-                    </div>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Calmar Ratio</h3>
-                    <p>{stats.get('calmar_ratio', 0):.4f}</p>
-                    <span class="tooltip-text">Ratio of average annual compounded return to maximum drawdown risk. Higher values indicate better risk-adjusted performance.</span>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Omega Ratio</h3>
-                    <p>{stats.get('omega_ratio', 0):.4f}</p>
-                    <span class="tooltip-text">Probability-weighted ratio of gains versus losses relative to a threshold. Values > 1 indicate positive risk-adjusted performance.</span>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Tail Risk (CVaR 99%)</h3>
-                    <p>{stats.get('cvar_99', 0):.2f}%</p>
-                    <span class="tooltip-text">Expected loss in the worst 1% of scenarios. More conservative risk measure than VaR.</span>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Beta (β)</h3>
-                    <p>{stats.get('beta', 0):.4f}</p>
-                    <span class="tooltip-text">Measure of systematic risk relative to market. β>1 indicates higher volatility than market.</span>
-                    <div class="market-interpretation">
-                        {
-                            "Highly Aggressive" if stats.get('beta', 0) > 1.5 else
-                            "Aggressive" if stats.get('beta', 0) > 1.2 else
-                            "Moderate" if stats.get('beta', 0) > 0.8 else
-                            "Defensive" if stats.get('beta', 0) > 0.5 else
-                            "Very Defensive"
-                        }
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <div class="section">
-            <h2>Technical Indicators</h2>
-            <div class="metrics">
-                <div class="metric-box tooltip">
-                    <h3>RSI (14-day)</h3>
-                    <p>{stats.get('rsi_14', 0):.2f}</p>
-                    <span class="tooltip-text">Relative Strength Index. Measures momentum. Values >70 indicate overbought, <30 oversold.</span>
-                    <div class="market-interpretation">
-                        {
-                            "Strongly Overbought" if stats.get('rsi_14', 0) > 80 else
-                            "Overbought" if stats.get('rsi_14', 0) > 70 else
-                            "Neutral" if stats.get('rsi_14', 0) > 30 else
-                            "Oversold" if stats.get('rsi_14', 0) > 20 else
-                            "Strongly Oversold"
-                        }
-                    </div>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Bollinger Band Width</h3>
-                    <p>{stats.get('bb_width', 0):.4f}</p>
-                    <span class="tooltip-text">Measures price volatility. Higher values indicate higher volatility.</span>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>MACD Signal</h3>
-                    <p>{stats.get('macd_signal', 'Neutral')}</p>
-                    <span class="tooltip-text">Moving Average Convergence/Divergence trend indicator.</span>
-                </div>
-            </div>
-        </div>
-
-        <div class="section">
-            <h2>Statistical Analysis</h2>
-            <div class="metrics">
-                <div class="metric-box tooltip">
-                    <h3>Hurst Exponent</h3>
-                    <p>{stats.get('hurst_exponent', 0):.4f}</p>
-                    <span class="tooltip-text">Measures long-term memory of time series. H>0.5 indicates trend-following, H<0.5 indicates mean-reversion.</span>
-                    <div class="market-interpretation">
-                        {
-                            "Strong Trend-Following" if stats.get('hurst_exponent', 0) > 0.65 else
-                            "Weak Trend-Following" if stats.get('hurst_exponent', 0) > 0.55 else
-                            "Random Walk" if stats.get('hurst_exponent', 0) > 0.45 else
-                            "Weak Mean-Reversion" if stats.get('hurst_exponent', 0) > 0.35 else
-                            "Strong Mean-Reversion"
-                        }
-                    </div>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Ljung-Box Test (p-value)</h3>
-                    <p>{stats.get('ljung_box_p', 0):.4f}</p>
-                    <span class="tooltip-text">Tests for presence of autocorrelation. Low p-values indicate significant autocorrelation.</span>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Jarque-Bera Test (p-value)</h3>
-                    <p>{stats.get('jarque_bera_p', 0):.4f}</p>
-                    <span class="tooltip-text">Tests for normality of returns. Low p-values indicate non-normal distribution.</span>
-                </div>
-            </div>
-        </div>
-
-        <div class="section">
-            <h2>Advanced Probability Analysis</h2>
-            <div class="metrics">
-                <div class="metric-box tooltip">
-                    <h3>Probability of New High</h3>
-                    <p>{stats.get('prob_new_high', 0):.2f}%</p>
-                    <span class="tooltip-text">Probability of reaching a new high within simulation period.</span>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Probability of 30%+ Gain</h3>
-                    <p>{stats.get('prob_up_30percent', 0):.2f}%</p>
-                    <span class="tooltip-text">Chance of at least 30% return</span>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Probability of 30%+ Loss</h3>
-                    <p>{stats.get('prob_down_30percent', 0):.2f}%</p>
-                    <span class="tooltip-text">Risk of at least 30% loss</span>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Expected Shortfall (2.5%)</h3>
-                    <p>{stats.get('expected_shortfall_97_5', 0):.2f}%</p>
-                    <span class="tooltip-text">Average loss in worst 2.5% of scenarios</span>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Gain/Loss Ratio</h3>
-                    <p>{stats.get('gain_loss_ratio', 0):.4f}</p>
-                    <span class="tooltip-text">Ratio of average gain to average loss. Higher values indicate better risk/reward.</span>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Win Rate</h3>
-                    <p>{stats.get('win_rate', 0):.2f}%</p>
-                    <span class="tooltip-text">Percentage of simulations resulting in profit</span>
-                </div>
-            </div>
-        </div>
-
-        <div class="section">
-            <h2>Regime Analysis</h2>
-            <div class="metrics">
-                <div class="metric-box tooltip">
-                    <h3>Current Regime</h3>
-                    <p>{stats.get('current_regime', 'Unknown')}</p>
-                    <span class="tooltip-text">Current market regime based on volatility and returns</span>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Regime Transition Probability</h3>
-                    <p>{stats.get('regime_transition_prob', 0):.2f}%</p>
-                    <span class="tooltip-text">Probability of regime change within simulation period</span>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Regime-Adjusted VaR</h3>
-                    <p>{stats.get('regime_adjusted_var', 0):.2f}%</p>
-                    <span class="tooltip-text">Value at Risk adjusted for current market regime</span>
-                </div>
-            </div>
-        </div>
-
-        <div class="section">
-            <h2>Jump Analysis</h2>
-            <div class="metrics">
-                <div class="metric-box tooltip">
-                    <h3>Jump Intensity (λ)</h3>
-                    <p>{stats.get('jump_intensity', 0):.2f} per year</p>
-                    <span class="tooltip-text">Expected number of jumps per year</span>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Mean Jump Size</h3>
-                    <p>{stats.get('jump_mean', 0)*100:.2f}%</p>
-                    <span class="tooltip-text">Average size of price jumps</span>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Jump Volatility</h3>
-                    <p>{stats.get('jump_sigma', 0)*100:.2f}%</p>
-                    <span class="tooltip-text">Volatility of jump sizes</span>
-                </div>
-                <div class="metric-box tooltip">
-                    <h3>Probability of Jump</h3>
-                    <p>{stats.get('prob_jump', 0):.2f}%</p>
-                    <span class="tooltip-text">Probability of at least one jump in simulation period</span>
-                </div>
-            </div>
-        </div>
-        
-        <div class="section">
-            <h2>Price Distribution</h2>
-            <div class="percentiles">
-                <table>
-                    <tr>
-                        <th>Percentile</th>
-                        <th>Price</th>
-                        <th>Return</th>
-                        <th>Interpretation</th>
-                    </tr>
-                    <tr>
-                        <td>5%</td>
-                        <td>${stats.get('percentiles', {}).get('5%', 0):.2f}</td>
-                        <td class="{('positive' if (stats.get('percentiles', {}).get('5%', 0)/initial_price - 1)*100 >= 0 else 'negative')}">{((stats.get('percentiles', {}).get('5%', 0)/initial_price - 1)*100):.2f}%</td>
-                        <td>Worst-case scenario (95% confidence)</td>
-                    </tr>
-                    <tr>
-                        <td>25%</td>
-                        <td>${stats.get('percentiles', {}).get('25%', 0):.2f}</td>
-                        <td class="{('positive' if (stats.get('percentiles', {}).get('25%', 0)/initial_price - 1)*100 >= 0 else 'negative')}">{((stats.get('percentiles', {}).get('25%', 0)/initial_price - 1)*100):.2f}%</td>
-                        <td>Lower quartile</td>
-                    </tr>
-                    <tr>
-                        <td>50% (Median)</td>
-                        <td>${stats.get('percentiles', {}).get('50%', 0):.2f}</td>
-                        <td class="{('positive' if (stats.get('percentiles', {}).get('50%', 0)/initial_price - 1)*100 >= 0 else 'negative')}">{((stats.get('percentiles', {}).get('50%', 0)/initial_price - 1)*100):.2f}%</td>
-                        <td>Most likely scenario</td>
-                    </tr>
-                    <tr>
-                        <td>75%</td>
-                        <td>${stats.get('percentiles', {}).get('75%', 0):.2f}</td>
-                        <td class="{('positive' if (stats.get('percentiles', {}).get('75%', 0)/initial_price - 1)*100 >= 0 else 'negative')}">{((stats.get('percentiles', {}).get('75%', 0)/initial_price - 1)*100):.2f}%</td>
-                        <td>Upper quartile</td>
-                    </tr>
-                    <tr>
-                        <td>95%</td>
-                        <td>${stats.get('percentiles', {}).get('95%', 0):.2f}</td>
-                        <td class="{('positive' if (stats.get('percentiles', {}).get('95%', 0)/initial_price - 1)*100 >= 0 else 'negative')}">{((stats.get('percentiles', {}).get('95%', 0)/initial_price - 1)*100):.2f}%</td>
-                        <td>Best-case scenario (95% confidence)</td>
-                    </tr>
-                </table>
-            </div>
-        </div>
-        
-        <div class="image-section">
-            <h2>Visualizations</h2>
-            <p>Click on any graph to enlarge</p>
-            <div class="image-grid">
-                <div class="image-container">
-                    <h3>Simulation Paths</h3>
-                    <img src="{paths_graph}" alt="Price Simulation Paths" onclick="openModal(this.src)">
-                </div>
-                <div class="image-container">
-                    <h3>Final Price Distribution</h3>
-                    <img src="{distribution_graph}" alt="Final Price Distribution" onclick="openModal(this.src)">
-                </div>
-                <div class="image-container">
-                    <h3>Returns Histogram</h3>
-                    <img src="{return_histogram_graph}" alt="Returns Histogram" onclick="openModal(this.src)">
-                </div>
-                <div class="image-container">
-                    <h3>QQ Plot</h3>
-                    <img src="{qq_plot_graph}" alt="QQ Plot" onclick="openModal(this.src)">
-                </div>
-                <div class="image-container">
-                    <h3>Returns Boxplot</h3>
-                    <img src="{returns_boxplot_graph}" alt="Returns Boxplot" onclick="openModal(this.src)">
-                </div>
-                <div class="image-container">
-                    <h3>Risk-Reward Analysis</h3>
-                    <img src="{risk_reward_graph}" alt="Risk-Reward Analysis" onclick="openModal(this.src)">
-                </div>
-                <div class="image-container">
-                    <h3>Historical Returns by Year</h3>
-                    <img src="{yearly_returns_graph}" alt="Historical Returns by Year" onclick="openModal(this.src)">
-                </div>
-            </div>
-        </div>
-        
-        <div class="footer">
-            <p>This report was generated using advanced Monte Carlo simulation techniques.</p>
-            <p>The analysis is based on {num_paths:,} simulated price paths over {stats.get('num_steps', 21)} trading days.</p>
-            <p>Past performance does not guarantee future results. This report is for educational purposes only.</p>
-            <a href="consolidated_report.html" class="back-link">← Back to All Stocks</a>
-        </div>
-    </div>
+    # Read every statistic shown in the report once
+    num_steps = stats.get('num_steps', 21)
+    mu = stats.get('mu', 0)
+    sigma = stats.get('sigma', 0)
+    return_volatility = stats.get('return_volatility', 0)
+    sharpe_ratio = stats.get('sharpe_ratio', 0)
+    sortino_ratio = stats.get('sortino_ratio', 0)
+    var_95 = stats.get('var_95', 0)
+    cvar_95 = stats.get('cvar_95', 0)
+    max_drawdown = stats.get('max_drawdown', 0)
+    skewness = stats.get('skewness', 0)
+    kurtosis = stats.get('kurtosis', 0)
+    treynor_ratio = stats.get('treynor_ratio', 0)
+    information_ratio = stats.get('information_ratio', 0)
+    calmar_ratio = stats.get('calmar_ratio', 0)
+    omega_ratio = stats.get('omega_ratio', 0)
+    cvar_99 = stats.get('cvar_99', 0)
+    beta = stats.get('beta', 0)
+    rsi_14 = stats.get('rsi_14', 0)
+    bb_width = stats.get('bb_width', 0)
+    macd_signal = stats.get('macd_signal', 'Neutral')
+    hurst_exponent = stats.get('hurst_exponent', 0)
+    ljung_box_p = stats.get('ljung_box_p', 0)
+    jarque_bera_p = stats.get('jarque_bera_p', 0)
+    prob_new_high = stats.get('prob_new_high', 0)
+    prob_up_30percent = stats.get('prob_up_30percent', 0)
+    prob_down_30percent = stats.get('prob_down_30percent', 0)
+    expected_shortfall_97_5 = stats.get('expected_shortfall_97_5', 0)
+    gain_loss_ratio = stats.get('gain_loss_ratio', 0)
+    win_rate = stats.get('win_rate', 0)
+    current_regime = stats.get('current_regime', 'Unknown')
+    regime_transition_prob = stats.get('regime_transition_prob', 0)
+    regime_adjusted_var = stats.get('regime_adjusted_var', 0)
+    jump_intensity = stats.get('jump_intensity', 0)
+    jump_mean = stats.get('jump_mean', 0)
+    jump_sigma = stats.get('jump_sigma', 0)
+    prob_jump = stats.get('prob_jump', 0)
+    percentiles = stats.get('percentiles', {})
     
-    <!-- Modal for enlarged images -->
-    <div id="imageModal" class="modal">
-        <span class="close" onclick="closeModal()">&times;</span>
-        <img class="modal-content" id="modalImg">
-    </div>
+    max_drawdown_pct = max_drawdown * 100
     
-    <script>
-        // Image modal functionality
-        function openModal(src) {{
-            var modal = document.getElementById("imageModal");
-            var modalImg = document.getElementById("modalImg");
-            modal.style.display = "block";
-            modalImg.src = src;
-        }}
-        
-        function closeModal() {{
-            var modal = document.getElementById("imageModal");
-            modal.style.display = "none";
-        }}
-        
-        // Close modal when clicking outside the image
-        window.onclick = function(event) {{
-            var modal = document.getElementById("imageModal");
-            if (event.target == modal) {{
-                modal.style.display = "none";
-            }}
-        }}
-        
-        // Enable tooltips
-        document.addEventListener('mouseover', function(e) {{
-            if (e.target.classList.contains('tooltip')) {{
-                const tooltip = e.target.querySelector('.tooltip-text');
-                if (tooltip) {{
-                    tooltip.style.visibility = 'visible';
-                    tooltip.style.opacity = '1';
-                }}
-            }}
-        }});
-        
-        document.addEventListener('mouseout', function(e) {{
-            if (e.target.classList.contains('tooltip')) {{
-                const tooltip = e.target.querySelector('.tooltip-text');
-                if (tooltip) {{
-                    tooltip.style.visibility = 'hidden';
-                    tooltip.style.opacity = '0';
-                }}
-            }}
-        }});
-    </script>
-</body>
-</html>
-"""
+    # Fill the precompiled report template with the formatted values; every
+    # value is formatted exactly once, even where the template shows it twice
+    ctx = {
+        'ticker': ticker,
+        'statistics': stats,
+        'assets_dir': assets_dir,
+        'generated_on': _GENERATED_ON_MARK,
+        'model_type': model_type.upper(),
+        'num_paths': f"{num_paths:,}",
+        'num_steps': num_steps,
+        'mu': f"{mu*100:.2f}",
+        'sigma': f"{sigma*100:.2f}",
+        'initial_price': f"{initial_price:.2f}",
+        'mean_final_price': f"{mean_final_price:.2f}",
+        'pct_return_class': ('positive' if pct_return >= 0 else 'negative'),
+        'pct_return': f"{pct_return:.2f}",
+        'pct_return_label': _interpret(pct_return, _PCT_RETURN_SCALE),
+        'return_volatility': f"{return_volatility:.2f}",
+        'return_volatility_label': _interpret(return_volatility, _RETURN_VOLATILITY_SCALE),
+        'sharpe_ratio_class': ('positive' if sharpe_ratio > 0.5 else 'negative'),
+        'sharpe_ratio': f"{sharpe_ratio:.2f}",
+        'sharpe_ratio_label': _interpret(sharpe_ratio, _SHARPE_RATIO_SCALE),
+        'sortino_ratio_class': ('positive' if sortino_ratio > 0.5 else 'negative'),
+        'sortino_ratio': f"{sortino_ratio:.2f}",
+        'sortino_ratio_label': _interpret(sortino_ratio, _SORTINO_RATIO_SCALE),
+        'var_95': f"{var_95:.2f}",
+        'var_95_label': _interpret(var_95, _VAR_95_SCALE),
+        'cvar_95': f"{cvar_95:.2f}",
+        'max_drawdown': f"{max_drawdown_pct:.2f}",
+        'max_drawdown_label': _interpret(max_drawdown_pct, _MAX_DRAWDOWN_SCALE),
+        'skewness': f"{skewness:.2f}",
+        'skewness_label': _interpret(skewness, _SKEWNESS_SCALE),
+        'kurtosis': f"{kurtosis:.2f}",
+        'kurtosis_label': _interpret(kurtosis, _KURTOSIS_SCALE),
+        'treynor_ratio': f"{treynor_ratio:.4f}",
+        'treynor_ratio_label': _interpret(treynor_ratio, _TREYNOR_RATIO_SCALE),
+        'information_ratio': f"{information_ratio:.4f}",
+        'information_ratio_label': _interpret(information_ratio, _INFORMATION_RATIO_SCALE),
+        'calmar_ratio': f"{calmar_ratio:.4f}",
+        'omega_ratio': f"{omega_ratio:.4f}",
+        'cvar_99': f"{cvar_99:.2f}",
+        'beta': f"{beta:.4f}",
+        'beta_label': _interpret(beta, _BETA_SCALE),
+        'rsi_14': f"{rsi_14:.2f}",
+        'rsi_14_label': _interpret(rsi_14, _RSI_14_SCALE),
+        'bb_width': f"{bb_width:.4f}",
+        'macd_signal': macd_signal,
+        'hurst_exponent': f"{hurst_exponent:.4f}",
+        'hurst_exponent_label': _interpret(hurst_exponent, _HURST_EXPONENT_SCALE),
+        'ljung_box_p': f"{ljung_box_p:.4f}",
+        'jarque_bera_p': f"{jarque_bera_p:.4f}",
+        'prob_new_high': f"{prob_new_high:.2f}",
+        'prob_up_30percent': f"{prob_up_30percent:.2f}",
+        'prob_down_30percent': f"{prob_down_30percent:.2f}",
+        'expected_shortfall_97_5': f"{expected_shortfall_97_5:.2f}",
+        'gain_loss_ratio': f"{gain_loss_ratio:.4f}",
+        'win_rate': f"{win_rate:.2f}",
+        'current_regime': current_regime,
+        'regime_transition_prob': f"{regime_transition_prob:.2f}",
+        'regime_adjusted_var': f"{regime_adjusted_var:.2f}",
+        'jump_intensity': f"{jump_intensity:.2f}",
+        'jump_mean': f"{jump_mean*100:.2f}",
+        'jump_sigma': f"{jump_sigma*100:.2f}",
+        'prob_jump': f"{prob_jump:.2f}",
+        'paths_graph': paths_graph,
+        'distribution_graph': distribution_graph,
+        'return_histogram_graph': return_histogram_graph,
+        'qq_plot_graph': qq_plot_graph,
+        'returns_boxplot_graph': returns_boxplot_graph,
+        'risk_reward_graph': risk_reward_graph,
+        'yearly_returns_graph': yearly_returns_graph,
+    }
+    
+    ctx['percentile_rows'] = _percentile_rows(percentiles, initial_price, paths_matrix)
     
-    # Write the HTML to file
-    with open(report_path, 'w') as f:
-        f.write(html_content)
+    # Stream the rendered report to disk as the template produces it, moving
+    # it into place only once it is complete; the whole body is only kept
+    # when it is admitted to the render cache
+    keep = cache_key is not None and _render_cache_admit()
+    try:
+        body = _stream_report(report_path, _get_template(STOCK_REPORT_TEMPLATE).generate(ctx),
+                              generated_on, keep=keep)
+    except OSError as e:
+        print(f"Error: Could not write report for {ticker}: {e}")
+        return None
+    if keep:
+        _render_cache_put(cache_key, body)
     
     print(f"Generated report for {ticker}: {report_path}")
     return report_path
 
 
+def _report_payload(result):
+    """
+    Drop the paths matrix from a result before handing it to a report worker.
+    
+    Reports only need the number of paths, so the matrix is replaced by its
+    length instead of being pickled to the worker process.
+    
+    Args:
+        result (dict): Simulation result dictionary
+        
+    Returns:
+        dict: Result without 'paths_matrix' and with 'num_paths' set
+    """
+    paths_matrix = result.get('paths_matrix')
+    if paths_matrix is None:
+        return result
+    payload = {key: value for key, value in result.items() if key != 'paths_matrix'}
+    payload.setdefault('num_paths', len(paths_matrix))
+    return payload
+
+
+def generate_reports(results, output_dir, max_workers=None):
+    """
+    Generate the stock reports for several tickers in parallel.
+    
+    Rendering and writing one ticker's report shares no state with the
+    others, so the reports are spread over a pool of worker processes.
+    
+    Args:
+        results (dict): Dictionary of simulation results keyed by ticker
+        output_dir (str): Directory to save the reports
+        max_workers (int, optional): Maximum number of worker processes
+            (defaults to the number of CPUs)
+        
+    Returns:
+        dict: Mapping of ticker to its report path (None on failure)
+    """
+    report_paths = {}
+    if not results:
+        return report_paths
+    
+    # Copy the shared assets up front so the workers only find them in place
+    os.makedirs(output_dir, exist_ok=True)
+    _ensure_assets(output_dir)
+    
+    max_workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=max(1, min(max_workers, len(results)))) as executor:
+        futures = {
+            executor.submit(generate_stock_report, ticker, _report_payload(result), output_dir): ticker
+            for ticker, result in results.items()
+        }
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                report_paths[ticker] = future.result()
+            except Exception as e:
+                print(f"Error generating report for {ticker}: {e}")
+                report_paths[ticker] = None
+    
+    return report_paths
+
+
 def generate_batch_report(results, output_dir):
     """
     Generate a batch report for multiple stock simulations.
@@ -835,11 +933,12 @@ def generate_batch_report(results, output_dir):
         str: Path to the generated report
     """
     # Ensure output directory exists
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    assets_dir = _ensure_assets(output_dir)
     
-    # Generate report filename
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    # Generate report filename; the same time is shown in the header
+    now = datetime.datetime.now()
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
     report_filename = f"batch_report_{timestamp}.html"
     report_path = os.path.join(output_dir, report_filename)
     
@@ -847,12 +946,11 @@ def generate_batch_report(results, output_dir):
     consolidated_report_path = os.path.join(output_dir, "consolidated_report.html")
     
     # Get the most recent ticker and its result
-    most_recent_ticker = list(results.keys())[-1] if results else None
-    most_recent_result = results.get(most_recent_ticker) if most_recent_ticker else None
+    most_recent_ticker = next(reversed(results), None)
+    most_recent_result = results[most_recent_ticker] if most_recent_ticker is not None else None
     
     # Only process the most recent simulation
-    summary_data = []
-    stock_details = []
+    stock = None
     
     if most_recent_result and 'statistics' not in most_recent_result:
         print(f"Error: Invalid result data for {most_recent_ticker}")
@@ -869,25 +967,14 @@ def generate_batch_report(results, output_dir):
         # Get required statistics
         initial_price = stats.get('initial_price', 0)
         mean_final_price = stats.get('mean_final_price', 0)
-        median_final_price = stats.get('percentiles', {}).get('50%', 0)
         min_price = stats.get('min_price', 0)
         max_price = stats.get('max_price', 0)
         std_dev = stats.get('std_final_price', 0)
-        percentile_5 = stats.get('percentiles', {}).get('5%', 0)
-        percentile_95 = stats.get('percentiles', {}).get('95%', 0)
-        
-        # Add to summary table
-        summary_data.append({
-            'Ticker': most_recent_ticker,
-            'Initial Price': f"${initial_price:.2f}",
-            'Mean Final Price': f"${mean_final_price:.2f}",
-            'Median Final Price': f"${median_final_price:.2f}",
-            'Min Price': f"${min_price:.2f}",
-            'Max Price': f"${max_price:.2f}",
-            'Std Dev': f"${std_dev:.2f}",
-            '5% Percentile': f"${percentile_5:.2f}",
-            '95% Percentile': f"${percentile_95:.2f}"
-        })
+        percentiles = stats.get('percentiles') or {}
+        percentile_5, percentile_25, median_final_price, percentile_75, percentile_95 = (
+            percentiles.get(key, 0) for key in ('5%', '25%', '50%', '75%', '95%'))
+        mu = model_params.get('mu', 0)
+        sigma = model_params.get('sigma', 0)
         
         # Get paths to graphs (relative to HTML file)
         ticker_paths_graph = f"/graphs/{most_recent_ticker}_paths.png"
@@ -897,179 +984,64 @@ def generate_batch_report(results, output_dir):
         downside_risk = (percentile_5 / initial_price - 1) * 100 if initial_price > 0 else 0
         upside_potential = (percentile_95 / initial_price - 1) * 100 if initial_price > 0 else 0
         
-        # Create detailed section for the most recent stock
-        stock_detail = f"""
-        <div class='stock-section'>
-            <h2>{most_recent_ticker} Detailed Analysis</h2>
-            <div class='statistics'>
-                <div class='stat-item'><strong>Initial Price:</strong> ${initial_price:.2f}</div>
-                <div class='stat-item'><strong>Annual Drift:</strong> {model_params.get('mu', 0)*100:.2f}%</div>
-                <div class='stat-item'><strong>Annual Volatility:</strong> {model_params.get('sigma', 0)*100:.2f}%</div>
-                <div class='stat-item'><strong>Expected Return:</strong> {stats.get('expected_return', 0):.2f}%</div>
-                <div class='stat-item'><strong>Downside Risk (5%):</strong> {downside_risk:.2f}%</div>
-                <div class='stat-item'><strong>Upside Potential (95%):</strong> {upside_potential:.2f}%</div>
-            </div>
-            
-            <h3>Price Distribution</h3>
-            <p>The simulation shows the potential price range for {most_recent_ticker} after running {actual_num_paths:,} simulation paths with {stats.get('num_steps', 21)} time steps:</p>
-            <ul>
-                <li><strong>Mean Final Price:</strong> ${mean_final_price:.2f}</li>
-                <li><strong>Median Final Price:</strong> ${median_final_price:.2f}</li>
-                <li><strong>Standard Deviation:</strong> ${std_dev:.2f}</li>
-                <li><strong>Minimum Final Price:</strong> ${min_price:.2f}</li>
-                <li><strong>Maximum Final Price:</strong> ${max_price:.2f}</li>
-            </ul>
-            
-            <h3>Percentiles</h3>
-            <ul>
-                <li><strong>5th Percentile:</strong> ${percentile_5:.2f}</li>
-                <li><strong>25th Percentile:</strong> ${stats.get('percentiles', {}).get('25%', 0):.2f}</li>
-                <li><strong>50th Percentile (Median):</strong> ${median_final_price:.2f}</li>
-                <li><strong>75th Percentile:</strong> ${stats.get('percentiles', {}).get('75%', 0):.2f}</li>
-                <li><strong>95th Percentile:</strong> ${percentile_95:.2f}</li>
-            </ul>
-            
-            <h3>Simulation Visualizations</h3>
-            <img src='{ticker_paths_graph}' alt='{most_recent_ticker} Simulation Paths'><img src='{ticker_dist_graph}' alt='{most_recent_ticker} Price Distribution'></div>"""
-        
-        stock_details.append(stock_detail)
-    
-    # Create the summary table HTML
-    if summary_data:
-        # Generate table HTML manually to match the old format exactly
-        table_rows = []
-        table_rows.append("<tr><th>Ticker</th><th>Initial Price</th><th>Mean Final Price</th><th>Median Final Price</th><th>Min Price</th><th>Max Price</th><th>Std Dev</th><th>5% Percentile</th><th>95% Percentile</th></tr>")
-        
-        for row in summary_data:
-            table_rows.append(f"""
-        <tr>
-            <td>{row['Ticker']}</td>
-            <td>{row['Initial Price']}</td>
-            <td>{row['Mean Final Price']}</td>
-            <td>{row['Median Final Price']}</td>
-            <td>{row['Min Price']}</td>
-            <td>{row['Max Price']}</td>
-            <td>{row['Std Dev']}</td>
-            <td>{row['5% Percentile']}</td>
-            <td>{row['95% Percentile']}</td>
-        </tr>
-        """)
-        
-        summary_table = "<table>" + "".join(table_rows) + "</table>"
-    else:
-        summary_table = "<p>No valid simulation results to display.</p>"
-    
-    # Create the complete HTML content
-    html_content = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Stock Price Forecast</title>
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            margin: 0;
-            padding: 0;
-            color: #333;
-            line-height: 1.6;
-        }}
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        h1, h2, h3 {{
-            color: #2c3e50;
-        }}
-        .header {{
-            padding: 20px;
-            background-color: #2c3e50;
-            color: white;
-            margin-bottom: 30px;
-        }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-bottom: 30px;
-            background-color: white;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }}
-        th {{
-            background-color: #2c3e50;
-            color: white;
-            text-align: left;
-            padding: 12px 15px;
-        }}
-        td {{
-            padding: 10px 15px;
-            border-bottom: 1px solid #ddd;
-        }}
-        tr:nth-child(even) {{
-            background-color: #f8f9fa;
-        }}
-        .stock-section {{
-            margin-bottom: 40px;
-            padding: 20px;
-            border-radius: 5px;
-            box-shadow: 0 0 10px rgba(0,0,0,0.1);
-        }}
-        .statistics {{
-            display: flex;
-            flex-wrap: wrap;
-        }}
-        .stat-item {{
-            width: 33%;
-            margin-bottom: 10px;
-        }}
-        img {{
-            max-width: 100%;
-            height: auto;
-            margin-top: 15px;
-            border: 1px solid #ddd;
-        }}
-        .positive {{
-            color: #28a745;
-            font-weight: bold;
-        }}
-        .negative {{
-            color: #dc3545;
-            font-weight: bold;
-        }}
-        .neutral {{
-            color: #6c757d;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>Stock Price Simulation Summary Report</h1>
-            <p>Generated on: {datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
-            <p>This report summarizes the Monte Carlo simulation results using a regime-switching, jump-diffusion model with earnings shocks.</p>
-        </div>
-        
-        <h2>Most Recent Simulation Results</h2>
-        {summary_table}
-        
-        {''.join(stock_details)}
-        
-        <div class="footer">
-            <p>Simulation powered by advanced stochastic modeling techniques. The results presented are for educational purposes only and should not be considered financial advice.</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+        # Values shown in the summary row and the detailed section
+        stock = {
+            'ticker': most_recent_ticker,
+            'initial_price': f"{initial_price:.2f}",
+            'mu': f"{mu*100:.2f}",
+            'sigma': f"{sigma*100:.2f}",
+            'expected_return': f"{stats.get('expected_return', 0):.2f}",
+            'downside_risk': f"{downside_risk:.2f}",
+            'upside_potential': f"{upside_potential:.2f}",
+            'num_paths': f"{actual_num_paths:,}",
+            'num_steps': stats.get('num_steps', 21),
+            'mean_final_price': f"{mean_final_price:.2f}",
+            'median_final_price': f"{median_final_price:.2f}",
+            'std_dev': f"{std_dev:.2f}",
+            'min_price': f"{min_price:.2f}",
+            'max_price': f"{max_price:.2f}",
+            'percentile_5': f"{percentile_5:.2f}",
+            'percentile_25': f"{percentile_25:.2f}",
+            'percentile_75': f"{percentile_75:.2f}",
+            'percentile_95': f"{percentile_95:.2f}",
+            'paths_graph': ticker_paths_graph,
+            'dist_graph': ticker_dist_graph,
+        }
     
-    # Write the HTML to file
-    with open(report_path, 'w') as f:
-        f.write(html_content)
+    # Reuse an identical report rendered earlier in this process if there is
+    # one; the cached body leaves out the generation time
+    body = cache_key = None
+    if most_recent_result:
+        cache_key = _batch_report_cache_key(list(results), most_recent_ticker,
+                                            model_params, stats, actual_num_paths)
+        body = _render_cache_get(cache_key)
+    generated_on = now.strftime("%Y-%m-%d %H:%M:%S")
     
-    # Also write to the consolidated report file
-    with open(consolidated_report_path, 'w') as f:
-        f.write(html_content)
+    # Write the report, streaming it to disk as the template produces it
+    # unless it was cached (the whole body is only kept when it is admitted
+    # to the cache), then hard link the finished file as the consolidated
+    # report instead of writing it twice
+    keep = False
+    try:
+        if body is not None:
+            _write_report(report_path, body, generated_on)
+            print(f"Reused cached batch report: {report_path}")
+        else:
+            ctx = {
+                'generated_on': _GENERATED_ON_MARK,
+                'tickers': list(results),
+                'stock': stock,
+                'assets_dir': assets_dir,
+            }
+            keep = cache_key is not None and _render_cache_admit()
+            body = _stream_report(report_path, _get_template(BATCH_REPORT_TEMPLATE).generate(ctx),
+                                  generated_on, keep=keep)
+        _link_or_copy(report_path, consolidated_report_path)
+    except OSError as e:
+        print(f"Error: Could not write batch report: {e}")
+        return None
+    if keep:
+        _render_cache_put(cache_key, body)
     
     print(f"Generated batch report: {report_path}")
     print(f"Created consolidated report: {consolidated_report_path}")
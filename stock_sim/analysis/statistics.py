@@ -10,6 +10,38 @@ import numpy as np
 from typing import Dict, Union, Optional
 
 
+# Percentiles of the final price distribution reported in the statistics
+PERCENTILE_LEVELS = (1, 5, 10, 25, 50, 75, 90, 95, 99)
+
+
+def _max_drawdowns_per_path(paths: np.ndarray) -> np.ndarray:
+    """
+    Calculate the maximum drawdown of every path in one pass over the matrix.
+    
+    Paths containing non-positive or non-finite values are assigned the
+    maximum possible drawdown of 1.0.
+    
+    Args:
+        paths (numpy.ndarray): Simulation paths array of shape (paths, steps)
+        
+    Returns:
+        numpy.ndarray: Maximum drawdown for each path
+    """
+    paths = paths.astype(np.float64)  # Ensure float type
+    
+    # Paths with non-positive or non-finite values get the maximum drawdown
+    invalid = ~np.all(np.isfinite(paths) & (paths > 0), axis=1)
+    
+    # Running maximum along each path, then drawdown from that peak
+    running_max = np.maximum.accumulate(paths, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdowns = (running_max - paths) / running_max
+    
+    max_drawdowns = np.max(drawdowns, axis=1)
+    max_drawdowns[invalid | ~np.isfinite(max_drawdowns)] = 1.0
+    return max_drawdowns
+
+
 def calculate_max_drawdown(paths: np.ndarray) -> float:
     """
     Calculate the average of maximum drawdowns across paths.
@@ -22,40 +54,8 @@ def calculate_max_drawdown(paths: np.ndarray) -> float:
     """
     if not isinstance(paths, np.ndarray) or paths.size == 0:
         return 0.0
-        
-    paths = paths.astype(np.float64)  # Ensure float type
-    max_drawdowns = []
-    
-    for i in range(paths.shape[0]):
-        path = paths[i, :]
-        
-        # Skip paths with non-positive or non-finite values
-        if np.any(~np.isfinite(path)) or np.any(path <= 0):
-            max_drawdowns.append(1.0)  # Maximum possible drawdown
-            continue
-            
-        # Calculate running maximum
-        running_max = np.maximum.accumulate(path)
-        
-        # Calculate drawdowns where running_max > 0
-        valid_indices = running_max > 0
-        if not np.any(valid_indices):
-            max_drawdowns.append(1.0)
-            continue
-            
-        drawdowns = np.zeros_like(path, dtype=np.float64)
-        drawdowns[valid_indices] = (running_max[valid_indices] - path[valid_indices]) / running_max[valid_indices]
-        
-        max_drawdown = np.nanmax(drawdowns)
-        if np.isfinite(max_drawdown):
-            max_drawdowns.append(float(max_drawdown))
-        else:
-            max_drawdowns.append(1.0)
     
-    if not max_drawdowns:
-        return 0.0
-        
-    return float(np.mean(max_drawdowns))  # Return average of maximum drawdowns
+    return float(np.mean(_max_drawdowns_per_path(paths)))  # Return average of maximum drawdowns
 
 
 def calculate_max_drawdown_across_paths(paths: np.ndarray) -> float:
@@ -70,49 +70,8 @@ def calculate_max_drawdown_across_paths(paths: np.ndarray) -> float:
     """
     if not isinstance(paths, np.ndarray) or paths.size == 0:
         return 0.0
-        
-    paths = paths.astype(np.float64)  # Ensure float type
-    max_drawdowns = []
     
-    for i in range(paths.shape[0]):
-        path = paths[i, :]
-        print(f"Path {i+1}: {path}")  # Debug: Print each path
-        
-        # Skip paths with non-positive or non-finite values
-        if np.any(~np.isfinite(path)) or np.any(path <= 0):
-            print(f"Path {i+1}: Invalid values, setting max drawdown to 1.0")  # Debug
-            max_drawdowns.append(1.0)  # Maximum possible drawdown
-            continue
-            
-        # Calculate running maximum
-        running_max = np.maximum.accumulate(path)
-        print(f"Path {i+1}: Running max: {running_max}")  # Debug
-        
-        # Calculate drawdowns where running_max > 0
-        valid_indices = running_max > 0
-        if not np.any(valid_indices):
-            print(f"Path {i+1}: No valid indices, setting max drawdown to 1.0")  # Debug
-            max_drawdowns.append(1.0)
-            continue
-            
-        drawdowns = np.zeros_like(path, dtype=np.float64)
-        drawdowns[valid_indices] = (running_max[valid_indices] - path[valid_indices]) / running_max[valid_indices]
-        print(f"Path {i+1}: Drawdowns: {drawdowns}")  # Debug
-        
-        max_drawdown = np.nanmax(drawdowns)
-        if np.isfinite(max_drawdown):
-            print(f"Path {i+1}: Max drawdown: {max_drawdown}")  # Debug
-            max_drawdowns.append(float(max_drawdown))
-        else:
-            print(f"Path {i+1}: Non-finite max drawdown, setting to 1.0")  # Debug
-            max_drawdowns.append(1.0)
-    
-    if not max_drawdowns:
-        return 0.0
-        
-    result = float(np.max(max_drawdowns))
-    print(f"Final max drawdown across all paths: {result}")  # Debug
-    return result
+    return float(np.max(_max_drawdowns_per_path(paths)))
 
 
 def calculate_statistics(ticker: str, simulation_paths: np.ndarray, initial_price: float) -> Dict[str, Union[float, Dict[str, float], Optional[float]]]:
@@ -133,11 +92,9 @@ def calculate_statistics(ticker: str, simulation_paths: np.ndarray, initial_pric
     if initial_price <= 0:
         raise ValueError("Initial price must be positive")
     
-    # Ensure float type for calculations
-    simulation_paths = simulation_paths.astype(np.float64)
-    
-    # Final prices (last column of each path)
-    final_prices = simulation_paths[:, -1].copy()
+    # Final prices (last column of each path), accumulated in float64 even when
+    # the paths themselves are stored in single precision
+    final_prices = simulation_paths[:, -1].astype(np.float64)
     
     # Replace infinite or negative values with NaN
     final_prices[~np.isfinite(final_prices)] = np.nan
@@ -158,23 +115,15 @@ def calculate_statistics(ticker: str, simulation_paths: np.ndarray, initial_pric
     
     # Calculate basic statistics
     mean_final_price = float(np.nanmean(final_prices))
-    median_final_price = float(np.nanmedian(final_prices))
     std_final_price = float(np.nanstd(final_prices))
-    min_final_price = float(np.nanmin(final_prices))
-    max_final_price = float(np.nanmax(final_prices))
     
-    # Calculate percentiles safely
-    percentiles = {
-        "1%": float(np.nanpercentile(final_prices, 1)),
-        "5%": float(np.nanpercentile(final_prices, 5)),
-        "10%": float(np.nanpercentile(final_prices, 10)),
-        "25%": float(np.nanpercentile(final_prices, 25)),
-        "50%": float(np.nanpercentile(final_prices, 50)),
-        "75%": float(np.nanpercentile(final_prices, 75)),
-        "90%": float(np.nanpercentile(final_prices, 90)),
-        "95%": float(np.nanpercentile(final_prices, 95)),
-        "99%": float(np.nanpercentile(final_prices, 99))
-    }
+    # Min, max and all percentiles from a single partition of the final prices
+    # instead of a separate partial sort for each one
+    quantiles = np.nanpercentile(final_prices, (0,) + PERCENTILE_LEVELS + (100,))
+    min_final_price = float(quantiles[0])
+    max_final_price = float(quantiles[-1])
+    percentiles = {f"{level}%": float(value) for level, value in zip(PERCENTILE_LEVELS, quantiles[1:-1])}
+    median_final_price = percentiles["50%"]
     
     # Calculate potential returns
     expected_return = float((mean_final_price / initial_price - 1) * 100)
@@ -4,7 +4,7 @@ Models Package
 Models for stock price simulation with various approaches.
 """
 
-from .base_model import StockModel, calculate_returns
+from .base_model import StockModel, calculate_returns, fetch_historical_data, fetch_historical_data_batch, iter_historical_data
 from .gbm_model import GBMModel
 from .jump_diffusion_model import JumpDiffusionModel
 from .hybrid_model import HybridModel
@@ -16,5 +16,8 @@ __all__ = [
     'JumpDiffusionModel', 
     'HybridModel',
     'ModelFactory',
-    'calculate_returns'
+    'calculate_returns',
+    'fetch_historical_data',
+    'fetch_historical_data_batch',
+    'iter_historical_data'
 ] 
\ No newline at end of file
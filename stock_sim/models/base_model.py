@@ -6,13 +6,57 @@ Base Simulation Models
 Base classes and interfaces for stock price simulations.
 """
 
+import os
+import importlib.util
 import numpy as np
 import pandas as pd
 import yfinance as yf
 from datetime import datetime
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
 import time
 
+# Parquet keeps dtypes and the DatetimeIndex exactly and is much smaller
+# than text formats; it needs pyarrow, so fall back to pickle without it.
+# pandas imports pyarrow itself, so only check that it is installed
+has_pyarrow = importlib.util.find_spec("pyarrow") is not None
+
+
+# Per-thread pool of scratch arrays reused across simulate() calls
+_scratch = threading.local()
+
+
+def _scratch_buffer(name, shape, dtype):
+    """
+    Get a reusable scratch array for intermediate simulation results.
+    
+    Repeated simulations (e.g. batch runs over many tickers) otherwise pay
+    for allocating and faulting in fresh (paths, steps) arrays every call.
+    Buffers are kept per thread, so concurrent simulations never share one,
+    and only the most recent shape is kept per name to bound memory. The
+    contents are undefined; callers must overwrite them, and must never
+    return them to the caller of simulate().
+    
+    Args:
+        name (str): Name of the buffer within the calling simulation
+        shape (tuple): Required array shape
+        dtype (numpy.dtype): Required array dtype
+        
+    Returns:
+        numpy.ndarray: Uninitialized array of the requested shape and dtype
+    """
+    buffers = getattr(_scratch, 'buffers', None)
+    if buffers is None:
+        buffers = _scratch.buffers = {}
+    
+    dtype = np.dtype(dtype)
+    buffer = buffers.get(name)
+    if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+        buffer = np.empty(shape, dtype=dtype)
+        buffers[name] = buffer
+    return buffer
+
 
 class StockModel(ABC):
     """
@@ -21,7 +65,8 @@ class StockModel(ABC):
     """
     
     def __init__(self, ticker, start_date=None, lookback_period="2y",
-                 calibrate=True, mu=None, sigma=None):
+                 calibrate=True, mu=None, sigma=None, historical_data=None, seed=None,
+                 antithetic=False):
         """
         Initialize the simulation model.
         
@@ -32,15 +77,31 @@ class StockModel(ABC):
             calibrate (bool): Whether to calibrate the model using historical data
             mu (float, optional): Drift parameter (annualized)
             sigma (float, optional): Volatility parameter (annualized)
+            historical_data (pandas.DataFrame, optional): Pre-fetched historical data;
+                when provided and non-empty, no download is performed
+            seed (int, numpy.random.SeedSequence or numpy.random.Generator, optional):
+                Seed for the model's own random stream, making simulations reproducible
+            antithetic (bool): Whether to use antithetic variates, pairing each path's
+                diffusion shocks with their negation to reduce Monte Carlo variance
         """
         self._ticker = ticker
         self._start_date = start_date if start_date else datetime.now()
         self._lookback_period = lookback_period
+        self._log_returns = None  # Computed lazily from the historical data
+        
+        # Each model draws from its own generator so results depend only on the
+        # seed, not on how many other models or threads are running
+        self._rng = np.random.default_rng(seed)
+        self._antithetic = antithetic
         
         # Load historical data with encapsulation
         retry_count = 0
         max_retries = 3
         
+        if historical_data is not None and not historical_data.empty:
+            self._historical_data = historical_data
+            retry_count = max_retries  # Skip the download loop
+        
         while retry_count < max_retries:
             self._historical_data = self._load_historical_data()
             if not self._historical_data.empty:
@@ -103,27 +164,15 @@ class StockModel(ABC):
     def historical_data(self):
         """Get the historical data."""
         return self._historical_data
+    
+    @property
+    def antithetic(self):
+        """Get whether antithetic variates are used."""
+        return self._antithetic
         
     def _load_historical_data(self):
         """Load historical price data for the ticker."""
-        try:
-            print(f"Fetching historical data for {self._ticker} with period {self._lookback_period}")
-            data = yf.download(
-                self._ticker,
-                period=self._lookback_period,
-                progress=False,
-                auto_adjust=True
-            )
-            if data.empty:
-                print(f"WARNING: Empty data returned for {self._ticker}")
-            else:
-                print(f"Successfully fetched {len(data)} rows for {self._ticker}")
-            return data
-        except Exception as e:
-            print(f"Error loading data for {self._ticker}: {e}")
-            import traceback
-            traceback.print_exc()
-            return pd.DataFrame()
+        return fetch_historical_data(self._ticker, self._lookback_period)
     
     def _calibrate_model(self):
         """Calibrate model parameters based on historical data."""
@@ -135,7 +184,7 @@ class StockModel(ABC):
                 return 0.08, 0.20  # Default values
                 
             print(f"Calibrating model for {self._ticker} with {len(close_prices)} data points")
-            returns = np.log(close_prices[1:] / close_prices[:-1])
+            returns = self._get_log_returns()
             
             # Calculate annualized parameters
             days_per_year = 252
@@ -150,8 +199,40 @@ class StockModel(ABC):
             traceback.print_exc()
             return 0.08, 0.20  # Default values
     
+    def _get_log_returns(self):
+        """Get daily log returns of the historical close prices, computed once and reused."""
+        if self._log_returns is None:
+            close_prices = np.asarray(self._historical_data['Close'].values, dtype=np.float64)
+            self._log_returns = calculate_returns(close_prices)
+        return self._log_returns
+    
+    def _standard_normal(self, out, path_axis=0):
+        """
+        Fill an array with standard normal variates from the model's stream.
+        
+        With antithetic variates only the first half of the paths is drawn and
+        the second half is its negation, so every shock has a mirrored twin.
+        
+        Args:
+            out (numpy.ndarray): Array to fill
+            path_axis (int): Axis of out that indexes the simulation paths
+            
+        Returns:
+            numpy.ndarray: The filled array
+        """
+        if not self._antithetic:
+            return self._rng.standard_normal(out=out, dtype=out.dtype)
+        
+        by_path = np.moveaxis(out, path_axis, 0)
+        n_paths = by_path.shape[0]
+        half = (n_paths + 1) // 2
+        draws = self._rng.standard_normal((half,) + by_path.shape[1:], dtype=out.dtype)
+        by_path[:half] = draws
+        np.negative(draws[:n_paths - half], out=by_path[half:])
+        return out
+    
     @abstractmethod
-    def simulate(self, paths=1000, steps=252, dt=1/252):
+    def simulate(self, paths=1000, steps=252, dt=1/252, dtype=np.float64):
         """
         Abstract method to simulate stock price paths.
         
@@ -159,6 +240,8 @@ class StockModel(ABC):
             paths (int): Number of simulation paths
             steps (int): Number of time steps
             dt (float): Time step size in years
+            dtype (numpy.dtype): Floating point type of the simulated paths;
+                np.float32 halves memory and bandwidth for large simulations
             
         Returns:
             numpy.ndarray: Array of shape (paths, steps+1) containing simulated paths
@@ -198,14 +281,169 @@ class StockModel(ABC):
         except Exception as e:
             print(f"Error in simulate_path for {self._ticker}: {str(e)}")
             # Return a simple path with modest growth as a fallback
-            path = np.zeros(steps)
             mu, sigma = 0.08/252, 0.2/np.sqrt(252)  # Default parameters
-            for i in range(steps):
-                # Simple Geometric Brownian Motion
-                path[i] = initial_price * np.exp((mu - 0.5 * sigma**2) * (i+1) + sigma * np.random.normal(0, np.sqrt(i+1)))
-            return path
+            elapsed = np.arange(1, steps + 1)
+            
+            # Simple Geometric Brownian Motion, with the normal draws for all steps in one block
+            shocks = self._rng.normal(0, np.sqrt(elapsed))
+            return initial_price * np.exp((mu - 0.5 * sigma**2) * elapsed + sigma * shocks)
 
 
 def calculate_returns(prices):
     """Calculate log returns from a price array."""
-    return np.log(prices[1:] / prices[:-1]) 
\ No newline at end of file
+    return np.log(prices[1:] / prices[:-1])
+
+
+# On-disk cache for historical downloads; enabled by pointing
+# STOCK_SIM_CACHE_DIR at a writable directory
+CACHE_DIR_ENV = "STOCK_SIM_CACHE_DIR"
+CACHE_TTL_SECONDS = 24 * 60 * 60  # Daily prices are refreshed at most once a day
+
+
+def _cache_path(ticker, period):
+    """Return the cache file path for a download, or None if caching is disabled."""
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if not cache_dir:
+        return None
+    extension = "parquet" if has_pyarrow else "pkl"
+    return os.path.join(cache_dir, f"{ticker}_{period}.{extension}")
+
+
+def _read_cached_data(cache_path):
+    """Return cached historical data if present and fresh, otherwise None."""
+    try:
+        if time.time() - os.path.getmtime(cache_path) > CACHE_TTL_SECONDS:
+            return None
+        if has_pyarrow:
+            data = pd.read_parquet(cache_path)
+        else:
+            data = pd.read_pickle(cache_path)
+        return None if data.empty else data
+    except Exception:
+        return None
+
+
+def _write_cached_data(cache_path, data):
+    """Store downloaded historical data in the cache, ignoring failures."""
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        if has_pyarrow:
+            data.to_parquet(cache_path, compression='snappy')
+        else:
+            data.to_pickle(cache_path)
+    except Exception as e:
+        print(f"Warning: Could not cache historical data at {cache_path}: {e}")
+
+
+def fetch_historical_data(ticker, period="2y"):
+    """
+    Download historical price data for a single ticker.
+    
+    When STOCK_SIM_CACHE_DIR is set, downloads are cached on disk for a day
+    and repeated runs read the cached copy instead of hitting Yahoo again.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        period (str): Period of historical data to download (e.g. "2y")
+        
+    Returns:
+        pandas.DataFrame: Historical price data (empty on failure)
+    """
+    cache_path = _cache_path(ticker, period)
+    if cache_path:
+        cached = _read_cached_data(cache_path)
+        if cached is not None:
+            print(f"Using cached historical data for {ticker} ({len(cached)} rows)")
+            return cached
+    
+    try:
+        print(f"Fetching historical data for {ticker} with period {period}")
+        data = yf.download(
+            ticker,
+            period=period,
+            progress=False,
+            auto_adjust=True
+        )
+        if data.empty:
+            print(f"WARNING: Empty data returned for {ticker}")
+        else:
+            print(f"Successfully fetched {len(data)} rows for {ticker}")
+            if cache_path:
+                _write_cached_data(cache_path, data)
+        return data
+    except Exception as e:
+        print(f"Error loading data for {ticker}: {e}")
+        import traceback
+        traceback.print_exc()
+        return pd.DataFrame()
+
+
+def fetch_historical_data_batch(tickers, period="2y", max_workers=10):
+    """
+    Download historical price data for several tickers concurrently.
+    
+    The downloads are I/O bound, so running them on a thread pool hides
+    the per-request network latency instead of paying it once per ticker.
+    
+    Args:
+        tickers (list): List of stock ticker symbols
+        period (str): Period of historical data to download (e.g. "2y")
+        max_workers (int): Maximum number of concurrent downloads
+        
+    Returns:
+        dict: Mapping of ticker to its historical data (empty DataFrame on failure)
+    """
+    results = {}
+    if not tickers:
+        return results
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers)))) as executor:
+        futures = {executor.submit(fetch_historical_data, ticker, period): ticker for ticker in tickers}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                results[ticker] = future.result()
+            except Exception as e:
+                print(f"Error loading data for {ticker}: {e}")
+                results[ticker] = pd.DataFrame()
+    
+    return results
+
+
+def iter_historical_data(tickers, period="2y", max_workers=10):
+    """
+    Download historical price data for several tickers, a bounded window ahead.
+    
+    Unlike fetch_historical_data_batch, at most max_workers downloads are in
+    flight or waiting to be consumed at any time, so a caller processing
+    tickers one by one can stop early without having fetched the whole list.
+    Closing the generator cancels the downloads that have not started yet.
+    
+    Args:
+        tickers (list): List of stock ticker symbols
+        period (str): Period of historical data to download (e.g. "2y")
+        max_workers (int): Number of tickers to download ahead of the consumer
+        
+    Yields:
+        tuple: (ticker, historical data), in the order of tickers (empty DataFrame on failure)
+    """
+    tickers = list(tickers)
+    if not tickers:
+        return
+    
+    window = max(1, min(max_workers, len(tickers)))
+    executor = ThreadPoolExecutor(max_workers=window)
+    try:
+        futures = [executor.submit(fetch_historical_data, ticker, period) for ticker in tickers[:window]]
+        for i, ticker in enumerate(tickers):
+            try:
+                data = futures[i].result()
+            except Exception as e:
+                print(f"Error loading data for {ticker}: {e}")
+                data = pd.DataFrame()
+            futures[i] = None  # Release the frame once it has been handed out
+            if i + window < len(tickers):
+                futures.append(executor.submit(fetch_historical_data, tickers[i + window], period))
+            yield ticker, data
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
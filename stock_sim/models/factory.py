@@ -48,8 +48,14 @@ class ModelFactory:
             
         model_type = model_type.lower()
         
+        # Pre-fetched historical data and random stream options shared by all model types
+        historical_data = kwargs.get('historical_data')
+        seed = kwargs.get('seed')
+        antithetic = kwargs.get('antithetic', False)
+        
         if model_type == 'gbm':
-            return GBMModel(ticker, start_date, lookback_period, calibrate, mu, sigma)
+            return GBMModel(ticker, start_date, lookback_period, calibrate, mu, sigma,
+                            historical_data=historical_data, seed=seed, antithetic=antithetic)
             
         elif model_type == 'jump':
             # Extract jump parameters from kwargs with defaults
@@ -59,7 +65,8 @@ class ModelFactory:
             
             return JumpDiffusionModel(
                 ticker, start_date, lookback_period, calibrate, mu, sigma,
-                jump_intensity, jump_mean, jump_sigma
+                jump_intensity, jump_mean, jump_sigma,
+                historical_data=historical_data, seed=seed, antithetic=antithetic
             )
             
         elif model_type in ['hybrid', 'combined']:
@@ -71,7 +78,8 @@ class ModelFactory:
             
             return HybridModel(
                 ticker, start_date, lookback_period, calibrate, mu, sigma,
-                vol_clustering, jump_intensity, jump_mean, jump_sigma
+                vol_clustering, jump_intensity, jump_mean, jump_sigma,
+                historical_data=historical_data, seed=seed, antithetic=antithetic
             )
             
         else:
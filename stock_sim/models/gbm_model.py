@@ -7,7 +7,7 @@ Implementation of the GBM stock price simulation model.
 """
 
 import numpy as np
-from .base_model import StockModel
+from .base_model import StockModel, _scratch_buffer
 
 
 class GBMModel(StockModel):
@@ -20,7 +20,7 @@ class GBMModel(StockModel):
     Implements simulate() method required by the base class.
     """
     
-    def simulate(self, paths=1000, steps=252, dt=1/252):
+    def simulate(self, paths=1000, steps=252, dt=1/252, dtype=np.float64):
         """
         Simulate stock price paths using Geometric Brownian Motion.
         
@@ -28,22 +28,25 @@ class GBMModel(StockModel):
             paths (int): Number of simulation paths
             steps (int): Number of time steps
             dt (float): Time step size in years
+            dtype (numpy.dtype): Floating point type of the simulated paths
             
         Returns:
             numpy.ndarray: Array of shape (paths, steps+1) containing simulated paths
         """
         # Initialize price matrix (each row is a path)
-        price_paths = np.zeros((paths, steps + 1))
+        price_paths = np.empty((paths, steps + 1), dtype=dtype)
         price_paths[:, 0] = self.initial_price
         
-        # Generate random normal variates
-        Z = np.random.normal(0, 1, (paths, steps))
+        # Generate random normal variates into a reused buffer and turn them
+        # into log-returns in place
+        log_returns = self._standard_normal(_scratch_buffer('log_returns', (paths, steps), dtype))
+        log_returns *= self.sigma * np.sqrt(dt)
+        log_returns += (self.mu - 0.5 * self.sigma**2) * dt
         
-        # Simulate paths
-        for t in range(1, steps + 1):
-            # GBM formula: S_t = S_{t-1} * exp((mu - 0.5*sigma^2)*dt + sigma*sqrt(dt)*Z)
-            price_paths[:, t] = price_paths[:, t-1] * np.exp(
-                (self.mu - 0.5 * self.sigma**2) * dt + self.sigma * np.sqrt(dt) * Z[:, t-1]
-            )
-            
-        return price_paths 
\ No newline at end of file
+        # GBM formula: S_t = S_0 * exp(sum of (mu - 0.5*sigma^2)*dt + sigma*sqrt(dt)*Z),
+        # evaluated for all steps in a single pass
+        np.cumsum(log_returns, axis=1, out=log_returns)
+        np.exp(log_returns, out=price_paths[:, 1:])
+        price_paths[:, 1:] *= self.initial_price
+        
+        return price_paths
@@ -7,7 +7,7 @@ Implementation of a combined model with GBM, jumps, and volatility clustering.
 """
 
 import numpy as np
-from .base_model import StockModel
+from .base_model import StockModel, _scratch_buffer
 from .jump_diffusion_model import JumpDiffusionModel
 
 
@@ -28,7 +28,8 @@ class HybridModel(StockModel):
     
     def __init__(self, ticker, start_date=None, lookback_period="2y", calibrate=True, 
                  mu=None, sigma=None, vol_clustering=0.85, 
-                 jump_intensity=10, jump_mean=-0.01, jump_sigma=0.02):
+                 jump_intensity=10, jump_mean=-0.01, jump_sigma=0.02,
+                 historical_data=None, seed=None, antithetic=False):
         """
         Initialize the combined model.
         
@@ -43,19 +44,28 @@ class HybridModel(StockModel):
             jump_intensity (float): Average number of jumps per year
             jump_mean (float): Mean of jump size distribution
             jump_sigma (float): Standard deviation of jump size distribution
+            historical_data (pandas.DataFrame, optional): Pre-fetched historical data
+            seed (int, numpy.random.SeedSequence or numpy.random.Generator, optional):
+                Seed for the model's random stream
+            antithetic (bool): Whether to use antithetic variates for the diffusion
+                and volatility shocks
         """
-        super().__init__(ticker, start_date, lookback_period, calibrate, mu, sigma)
+        super().__init__(ticker, start_date, lookback_period, calibrate, mu, sigma,
+                         historical_data=historical_data, seed=seed, antithetic=antithetic)
         
         # Additional parameters with encapsulation
         self._vol_clustering = vol_clustering
         
-        # Create jump model with composition (prefer composition over inheritance)
+        # Create jump model with composition (prefer composition over inheritance);
+        # it reuses the data loaded above instead of downloading it again
         self._jump_model = JumpDiffusionModel(
             ticker, start_date, lookback_period, calibrate, 
             mu=mu, sigma=sigma, 
             jump_intensity=jump_intensity, 
             jump_mean=jump_mean, 
-            jump_sigma=jump_sigma
+            jump_sigma=jump_sigma,
+            historical_data=self._historical_data,
+            seed=self._rng  # Share one stream so jumps never mirror the diffusion draws
         )
     
     @property
@@ -68,7 +78,7 @@ class HybridModel(StockModel):
         """Get the underlying jump diffusion model."""
         return self._jump_model
     
-    def simulate(self, paths=1000, steps=252, dt=1/252):
+    def simulate(self, paths=1000, steps=252, dt=1/252, dtype=np.float64):
         """
         Simulate stock price paths using the combined model.
         
@@ -76,45 +86,60 @@ class HybridModel(StockModel):
             paths (int): Number of simulation paths
             steps (int): Number of time steps
             dt (float): Time step size in years
+            dtype (numpy.dtype): Floating point type of the simulated paths
             
         Returns:
             numpy.ndarray: Array of shape (paths, steps+1) containing simulated paths
         """
         # Initialize price matrix
-        price_paths = np.zeros((paths, steps + 1))
+        price_paths = np.empty((paths, steps + 1), dtype=dtype)
         price_paths[:, 0] = self.initial_price
         
-        # Generate random normal variates for diffusion
-        Z = np.random.normal(0, 1, (paths, steps))
+        # Random variates are laid out step-major (steps, paths) so that each
+        # step of the volatility recursion reads and writes one contiguous row;
+        # they are generated into scratch buffers reused across calls
+        Z = self._standard_normal(_scratch_buffer('hybrid_z', (steps, paths), dtype), path_axis=1)
+        vol_shocks = self._standard_normal(
+            _scratch_buffer('hybrid_vol_shocks', (steps, paths), dtype), path_axis=1)
+        vol_shocks *= 0.05
         
-        # Initial volatility is the calibrated sigma
-        vol = np.ones(paths) * self.sigma
+        # Jumps for all paths and steps come from the jump model in one batch
+        jumps = self._jump_model.generate_jumps(paths, steps, dt, dtype=dtype)
+        
+        # Bind per-step constants once instead of re-reading attributes
+        # and recomputing them on every iteration
+        vol_clustering = self._vol_clustering
+        vol_mean_reversion = (1 - vol_clustering) * self.sigma
+        mu_dt = self.mu * dt
+        half_dt = 0.5 * dt
+        sqrt_dt = np.sqrt(dt)
         
-        # Jump parameters
-        jump_prob = self._jump_model.jump_intensity * dt
+        # Initial volatility is the calibrated sigma
+        vol = np.full(paths, self.sigma, dtype=dtype)
+        vol_history = _scratch_buffer('hybrid_vol_history', (steps, paths), dtype)
         
-        # Simulate paths
-        for t in range(1, steps + 1):
+        # Simulate the volatility process; only this recursion is sequential
+        for t in range(steps):
             # Volatility clustering - GARCH-like effect
-            vol_shock = np.random.normal(0, 0.05, paths)
-            vol = self._vol_clustering * vol + (1 - self._vol_clustering) * self.sigma + vol_shock
-            vol = np.maximum(vol, 0.05)  # Ensure minimum volatility
-            
-            # Generate jump indicators and sizes
-            jump_indicators = np.random.random(paths) < jump_prob
-            jump_sizes = np.zeros(paths)
-            jumps_count = jump_indicators.sum()
-            
-            if jumps_count > 0:
-                jump_sizes[jump_indicators] = np.random.normal(
-                    self._jump_model.jump_mean, 
-                    self._jump_model.jump_sigma, 
-                    size=jumps_count
-                )
-            
-            # Combined model formula
-            price_paths[:, t] = price_paths[:, t-1] * np.exp(
-                (self.mu - 0.5 * vol**2) * dt + vol * np.sqrt(dt) * Z[:, t-1] + jump_sizes
-            )
-            
-        return price_paths 
\ No newline at end of file
+            vol *= vol_clustering
+            vol += vol_mean_reversion
+            vol += vol_shocks[t]
+            np.maximum(vol, 0.05, out=vol)  # Ensure minimum volatility
+            vol_history[t] = vol
+        
+        # Combined model log-returns for all steps at once, computed in place:
+        # mu*dt - 0.5*vol^2*dt + vol*sqrt(dt)*Z = vol*(sqrt(dt)*Z - 0.5*dt*vol) + mu*dt
+        log_increments = Z
+        log_increments *= sqrt_dt
+        np.multiply(vol_history, half_dt, out=vol_shocks)  # Shocks are no longer needed
+        log_increments -= vol_shocks
+        log_increments *= vol_history
+        log_increments += mu_dt
+        log_increments += jumps.T
+        
+        # Apply all steps to the prices in a single cumulative pass
+        np.cumsum(log_increments, axis=0, out=log_increments)
+        np.exp(log_increments, out=price_paths[:, 1:].T)
+        price_paths[:, 1:] *= self.initial_price
+        
+        return price_paths
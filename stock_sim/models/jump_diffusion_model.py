@@ -7,7 +7,7 @@ Implementation of the Jump Diffusion model for stock price simulation.
 """
 
 import numpy as np
-from .base_model import StockModel
+from .base_model import StockModel, _scratch_buffer
 
 
 class JumpDiffusionModel(StockModel):
@@ -24,7 +24,8 @@ class JumpDiffusionModel(StockModel):
     
     def __init__(self, ticker, start_date=None, lookback_period="2y",
                  calibrate=True, mu=None, sigma=None, 
-                 jump_intensity=10, jump_mean=-0.01, jump_sigma=0.02):
+                 jump_intensity=10, jump_mean=-0.01, jump_sigma=0.02,
+                 historical_data=None, seed=None, antithetic=False):
         """
         Initialize the jump diffusion model with jump parameters.
         
@@ -38,8 +39,13 @@ class JumpDiffusionModel(StockModel):
             jump_intensity (float): Average number of jumps per year
             jump_mean (float): Mean of jump size distribution
             jump_sigma (float): Standard deviation of jump size distribution
+            historical_data (pandas.DataFrame, optional): Pre-fetched historical data
+            seed (int, numpy.random.SeedSequence or numpy.random.Generator, optional):
+                Seed for the model's random stream
+            antithetic (bool): Whether to use antithetic variates for the diffusion shocks
         """
-        super().__init__(ticker, start_date, lookback_period, calibrate, mu, sigma)
+        super().__init__(ticker, start_date, lookback_period, calibrate, mu, sigma,
+                         historical_data=historical_data, seed=seed, antithetic=antithetic)
         
         # Jump parameters with encapsulation
         self._jump_intensity = jump_intensity
@@ -68,9 +74,8 @@ class JumpDiffusionModel(StockModel):
     def _calibrate_jump_parameters(self):
         """Calibrate jump parameters based on historical data."""
         try:
-            # Get returns
-            close_prices = self.historical_data['Close'].values
-            returns = np.log(close_prices[1:] / close_prices[:-1])
+            # Get returns (shared with the drift/volatility calibration)
+            returns = self._get_log_returns()
             
             # Identify potential jumps (returns exceeding 2 standard deviations)
             std_dev = returns.std()
@@ -96,7 +101,37 @@ class JumpDiffusionModel(StockModel):
             self._jump_mean = -0.01
             self._jump_sigma = 0.02
     
-    def simulate(self, paths=1000, steps=252, dt=1/252):
+    def generate_jumps(self, paths, steps, dt=1/252, dtype=np.float64):
+        """
+        Generate the log jump sizes for whole paths in one batch.
+        
+        Args:
+            paths (int): Number of simulation paths
+            steps (int): Number of time steps
+            dt (float): Time step size in years
+            dtype (numpy.dtype): Floating point type of the returned matrix
+            
+        Returns:
+            numpy.ndarray: Array of shape (paths, steps) with the log jump size
+                at each step (0 where no jump occurs)
+        """
+        n_cells = paths * steps
+        jumps = np.zeros(n_cells, dtype=dtype)
+        
+        # Jumps are sparse (intensity * dt is small), so draw the total number
+        # of jumps over the whole grid from the Poisson process, scatter them
+        # uniformly and draw sizes only for those instead of for every step
+        n_jumps = self._rng.poisson(self._jump_intensity * dt * n_cells)
+        if n_jumps > 0:
+            jump_idx = self._rng.integers(0, n_cells, n_jumps)
+            jump_sizes = self._rng.standard_normal(n_jumps, dtype=dtype)
+            jump_sizes *= self._jump_sigma
+            jump_sizes += self._jump_mean
+            np.add.at(jumps, jump_idx, jump_sizes)  # Coinciding jumps compound
+        
+        return jumps.reshape(paths, steps)
+    
+    def simulate(self, paths=1000, steps=252, dt=1/252, dtype=np.float64):
         """
         Simulate stock price paths using a Jump Diffusion model.
         
@@ -104,37 +139,28 @@ class JumpDiffusionModel(StockModel):
             paths (int): Number of simulation paths
             steps (int): Number of time steps
             dt (float): Time step size in years
+            dtype (numpy.dtype): Floating point type of the simulated paths
             
         Returns:
             numpy.ndarray: Array of shape (paths, steps+1) containing simulated paths
         """
         # Initialize price matrix
-        price_paths = np.zeros((paths, steps + 1))
+        price_paths = np.empty((paths, steps + 1), dtype=dtype)
         price_paths[:, 0] = self.initial_price
         
-        # Generate random normal variates for diffusion
-        Z = np.random.normal(0, 1, (paths, steps))
+        # Generate random normal variates for diffusion into a reused buffer
+        # and turn them into log-increments in place
+        log_increments = self._standard_normal(
+            _scratch_buffer('log_increments', (paths, steps), dtype))
+        log_increments *= self.sigma * np.sqrt(dt)
+        log_increments += (self.mu - 0.5 * self.sigma**2) * dt
         
-        # Jump parameters
-        jump_prob = self._jump_intensity * dt  # Probability of a jump in this time step
+        # Fold the jumps for every step into the same log-increment matrix
+        log_increments += self.generate_jumps(paths, steps, dt, dtype=dtype)
         
-        # Simulate paths
-        for t in range(1, steps + 1):
-            # Generate jump indicators (Poisson process)
-            jump_indicators = np.random.random(paths) < jump_prob
-            
-            # Generate jump sizes (only for paths with jumps)
-            jump_sizes = np.zeros(paths)
-            jumps_count = jump_indicators.sum()
-            
-            if jumps_count > 0:
-                jump_sizes[jump_indicators] = np.random.normal(
-                    self._jump_mean, self._jump_sigma, size=jumps_count
-                )
-            
-            # GBM formula with jumps
-            price_paths[:, t] = price_paths[:, t-1] * np.exp(
-                (self.mu - 0.5 * self.sigma**2) * dt + self.sigma * np.sqrt(dt) * Z[:, t-1] + jump_sizes
-            )
-            
-        return price_paths 
\ No newline at end of file
+        # GBM formula with jumps, applied to all steps in a single pass
+        np.cumsum(log_increments, axis=1, out=log_increments)
+        np.exp(log_increments, out=price_paths[:, 1:])
+        price_paths[:, 1:] *= self.initial_price
+        
+        return price_paths
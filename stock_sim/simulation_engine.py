@@ -9,6 +9,7 @@ Core simulation engine for running stock price simulations.
 import os
 import json
 import time
+import numpy as np
 from datetime import datetime
 from .models import ModelFactory
 from typing import Dict, Any, List, Optional, Callable
@@ -46,7 +47,8 @@ class SimulationEngine:
                 os.makedirs(directory)
                 print(f"Created directory: {directory}")
     
-    def run_simulation(self, ticker: str, model_config: Dict[str, Any], calibrate: bool = True, simulation_id: Optional[Any] = None):
+    def run_simulation(self, ticker: str, model_config: Dict[str, Any], calibrate: bool = True, simulation_id: Optional[Any] = None,
+                       historical_data=None, save_data: bool = True, generate_report: bool = True):
         """
         Runs a single stock simulation using the provided configuration.
 
@@ -58,9 +60,17 @@ class SimulationEngine:
                 - steps (int): Number of time steps per path
                 - dt (float): Time step size (e.g., 1/252 for daily)
                 - lookback_period (str): Period for historical data (e.g., "2y")
+                - seed (int, optional): Random seed for reproducible paths
+                - dtype (str, optional): Floating point type of the paths ('float64' or 'float32')
+                - antithetic (bool, optional): Pair each path with a mirrored twin to reduce variance
                 - Other model-specific parameters...
             calibrate (bool): Whether to calibrate the model using historical data
             simulation_id (any): Optional ID for tracking simulation status
+            historical_data (pandas.DataFrame, optional): Pre-fetched historical data for the ticker
+            save_data (bool): Whether to save the simulation data; batch_simulate saves
+                all tickers together afterwards, so the result's 'data_path' is None then
+            generate_report (bool): Whether to generate the stock report; batch_simulate
+                generates all tickers' reports together afterwards
 
         Returns:
             dict: Simulation results and statistics
@@ -85,10 +95,12 @@ class SimulationEngine:
             dt = float(model_config.get('dt', 1/252))
             lookback_period = model_config.get('lookback_period', '2y')
             save_full_paths = model_config.get('save_full_paths', False)  # Default to False to save disk space
+            # float32 halves the memory and bandwidth of the path matrix; statistics are still computed in float64
+            dtype = np.dtype(model_config.get('dtype', 'float64'))
 
             # Separate model-specific kwargs from general config
             # Exclude keys already explicitly handled
-            known_keys = {'model_type', 'paths', 'steps', 'dt', 'lookback_period', 'save_full_paths'}
+            known_keys = {'model_type', 'paths', 'steps', 'dt', 'lookback_period', 'save_full_paths', 'dtype'}
             model_specific_kwargs = {k: v for k, v in model_config.items() if k not in known_keys}
 
             # Reset stop flag if a simulation ID is provided
@@ -112,6 +124,7 @@ class SimulationEngine:
                     ticker=ticker,
                     lookback_period=lookback_period,
                     calibrate=calibrate,
+                    historical_data=historical_data,
                     **model_specific_kwargs # Pass other params from config
                 )
             except ValueError as e:
@@ -132,7 +145,7 @@ class SimulationEngine:
             
             # Run simulation
             print(f"Running {model_type.upper()} simulation for {ticker} with {paths} paths and {steps} steps...")
-            paths_matrix = model.simulate(paths=paths, steps=steps, dt=dt)
+            paths_matrix = model.simulate(paths=paths, steps=steps, dt=dt, dtype=dtype)
             
             # Check if stop was requested
             if simulation_id is not None and self._stop_requested.get(simulation_id, False):
@@ -155,8 +168,10 @@ class SimulationEngine:
                 raise ValueError(f"Failed to calculate statistics for {ticker}")
             
             # Save simulation data
-            from .analysis import save_simulation_data
-            data_path = save_simulation_data(ticker, paths_matrix, statistics, self._data_dir, save_full_paths=save_full_paths)
+            data_path = None
+            if save_data:
+                from .analysis import save_simulation_data
+                data_path = save_simulation_data(ticker, paths_matrix, statistics, self._data_dir, save_full_paths=save_full_paths)
             
             # Check if stop was requested
             if simulation_id is not None and self._stop_requested.get(simulation_id, False):
@@ -184,6 +199,7 @@ class SimulationEngine:
                     'dt': dt,
                     'lookback_period': lookback_period,
                     'calibrate': calibrate,
+                    'dtype': dtype.name,
                     **model_specific_kwargs
                 }
             }
@@ -194,9 +210,10 @@ class SimulationEngine:
                 raise InterruptedError(f"Simulation for {ticker} was stopped by user")
             
             # Generate report if available
-            report_path = self._generate_report(ticker, result)
-            if report_path:
-                result['report_path'] = report_path
+            if generate_report:
+                report_path = self._generate_report(ticker, result)
+                if report_path:
+                    result['report_path'] = report_path
             
             # Clean up stop tracking if simulation completed successfully
             if simulation_id is not None and simulation_id in self._stop_requested:
@@ -275,17 +292,15 @@ class SimulationEngine:
             # Import the reporting module
             from .analysis import generate_stock_report
             
-            # Create a modified result with the needed structure for the report generator
+            # Create a modified result with the needed structure for the report generator;
+            # the report only needs the number of paths, not the paths themselves
             report_result = {
-                'statistics': result['statistics'].copy(),
-                'paths_matrix': result['paths_matrix'],
+                'statistics': result['statistics'],
+                'num_paths': len(result['paths_matrix']),
                 'model_type': result['model_type'],
                 'model_params': result['model_params']
             }
             
-            # Ensure num_paths is set in statistics
-            report_result['statistics']['num_paths'] = result['paths_matrix'].shape[0]
-            
             # Generate the report
             report_path = generate_stock_report(ticker, report_result, self._reports_dir)
             print(f"Generated report for {ticker}: {report_path}")
@@ -319,6 +334,16 @@ class SimulationEngine:
         total_tickers = len(tickers)
         print(f"Starting batch simulation for {total_tickers} stocks...")
         
+        # Download historical data concurrently, a bounded window ahead of the
+        # ticker being simulated, so stopping the batch stops the downloads too
+        from .models import iter_historical_data
+        prefetched_data = iter_historical_data(tickers, model_config.get('lookback_period', '2y'))
+        
+        # Derive an independent random stream per ticker from the batch seed, so
+        # each ticker's paths are reproducible regardless of processing order
+        batch_seed = model_config.get('seed')
+        ticker_seeds = np.random.SeedSequence(batch_seed).spawn(total_tickers) if batch_seed is not None else None
+        
         try:
             for i, ticker in enumerate(tickers):
                 if simulation_id is not None and self._stop_requested.get(simulation_id, False):
@@ -332,7 +357,14 @@ class SimulationEngine:
                     status_callback(ticker=ticker, status="running", progress=progress)
                 
                 try:
-                    result = self.run_simulation(ticker, model_config, simulation_id=simulation_id)
+                    _, historical_data = next(prefetched_data)
+                    ticker_config = model_config
+                    if ticker_seeds is not None:
+                        ticker_config = {**model_config, 'seed': int(ticker_seeds[i].generate_state(1)[0])}
+                    
+                    result = self.run_simulation(ticker, ticker_config, simulation_id=simulation_id,
+                                                 historical_data=historical_data,
+                                                 save_data=False, generate_report=False)
                     results[ticker] = result
                     if status_callback:
                         status_callback(ticker=ticker, status="completed", progress=progress)
@@ -345,28 +377,55 @@ class SimulationEngine:
                     if status_callback:
                         status_callback(ticker=ticker, status="error", error=str(e), progress=progress)
             
-            # Generate batch report if results exist
+            # Save data and generate batch report if results exist
             if results:
-                self._generate_batch_report(results)
-                
-                # Clean up raw data files to save disk space
-                from .analysis import cleanup_raw_data
-                cleanup_raw_data(data_dir=self._data_dir)
+                self._finish_batch(results, model_config)
                 
             return results
             
         except InterruptedError:
-            # Still generate batch report for completed simulations
+            # Still save and report the completed simulations
             if results:
-                self._generate_batch_report(results)
-                
-                # Clean up raw data files to save disk space
-                from .analysis import cleanup_raw_data
-                cleanup_raw_data(data_dir=self._data_dir)
+                self._finish_batch(results, model_config)
                 
             if status_callback:
                 status_callback(ticker="batch", status="interrupted", progress=100)
             raise
+        finally:
+            prefetched_data.close()
+    
+    def _finish_batch(self, results, model_config):
+        """Save the data of a batch's completed simulations, report them and clean up."""
+        # Save all tickers together, overlapping their disk writes
+        from .analysis import save_many
+        data_paths = save_many(
+            [(ticker, result['paths_matrix'], result['statistics']) for ticker, result in results.items()],
+            self._data_dir, save_full_paths=model_config.get('save_full_paths', False)
+        )
+        for ticker, data_path in data_paths.items():
+            results[ticker]['data_path'] = data_path
+        
+        # Render the stock reports in parallel worker processes
+        self._generate_reports(results)
+        self._generate_batch_report(results)
+        
+        # Clean up raw data files to save disk space
+        from .analysis import cleanup_raw_data
+        cleanup_raw_data(data_dir=self._data_dir)
+    
+    def _generate_reports(self, results):
+        """Generate the HTML reports for several simulation results."""
+        try:
+            from .analysis import generate_reports
+            report_paths = generate_reports(results, self._reports_dir)
+        except Exception as e:
+            print(f"Warning: Could not generate reports: {e}")
+            return
+        
+        for ticker, report_path in report_paths.items():
+            if report_path:
+                results[ticker]['report_path'] = report_path
+                print(f"Generated report for {ticker}: {report_path}")
     
     def _generate_batch_report(self, results):
         """Generate aggregate report for batch simulation."""
@@ -13,6 +13,7 @@ matplotlib.use('Agg')  # Use non-interactive backend for thread safety
 import os
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 import seaborn as sns
 import scipy.stats as stats
 import yfinance as yf
@@ -61,15 +62,21 @@ def create_price_path_plot(ticker, paths, statistics, sample_size=50):
     # Get the initial price
     initial_price = statistics['initial_price']
     
-    # Plot sample paths
-    for i in range(sample_paths.shape[0]):
-        ax.plot(range(sample_paths.shape[1]), sample_paths[i], alpha=0.3, linewidth=0.8)
-    
-    # Calculate percentiles for each time step
+    # Plot all sample paths as a single LineCollection instead of one Line2D
+    # per path, cycling through the style's colors like individual plots would
+    n_sample, n_points = sample_paths.shape
+    segments = np.empty((n_sample, n_points, 2))
+    segments[:, :, 0] = np.arange(n_points)
+    segments[:, :, 1] = sample_paths
+    cycle_colors = plt.rcParams['axes.prop_cycle'].by_key()['color']
+    ax.add_collection(LineCollection(segments, colors=cycle_colors, alpha=0.3, linewidths=0.8))
+    ax.autoscale_view()
+    
+    # Calculate all percentiles for every time step in one call on a
+    # step-major copy, so each step's prices are contiguous and partitioned once
     steps = list(range(paths.shape[1]))
-    p05 = [np.percentile(paths[:, i], 5) for i in steps]
-    p50 = [np.percentile(paths[:, i], 50) for i in steps]
-    p95 = [np.percentile(paths[:, i], 95) for i in steps]
+    step_prices = np.ascontiguousarray(paths.T)
+    p05, p50, p95 = np.percentile(step_prices, [5, 50, 95], axis=1)
     
     # Plot percentiles using the original color scheme
     ax.plot(steps, p50, color='red', linewidth=2, label='Median')
@@ -305,20 +312,12 @@ def create_risk_reward_plot(ticker, paths, statistics):
     groups = min(25, paths.shape[0] // 10)  # Divide paths into groups
     paths_per_group = paths.shape[0] // groups
     
-    group_returns = []
-    group_risks = []
-    
-    for i in range(groups):
-        start_idx = i * paths_per_group
-        end_idx = (i + 1) * paths_per_group
-        
-        group_paths = paths[start_idx:end_idx, :]
-        group_final_prices = group_paths[:, -1]
-        group_return = (np.mean(group_final_prices) / statistics["initial_price"] - 1) * 100
-        group_risk = np.std(group_final_prices) / statistics["initial_price"] * 100
-        
-        group_returns.append(group_return)
-        group_risks.append(group_risk)
+    # Final prices arranged as one row per group, so every group's
+    # return and risk land in preallocated arrays in a single pass
+    initial_price = statistics["initial_price"]
+    group_final_prices = paths[:groups * paths_per_group, -1].reshape(groups, paths_per_group)
+    group_returns = (np.mean(group_final_prices, axis=1) / initial_price - 1) * 100
+    group_risks = np.std(group_final_prices, axis=1) / initial_price * 100
     
     # Plot the risk-reward scatter with viridis colormap like the original
     scatter = ax.scatter(group_risks, group_returns, alpha=0.7, s=50, c=group_returns, cmap='viridis')
@@ -28,7 +28,7 @@ from flask import Flask, render_template, request, redirect, url_for, jsonify, s
 # Updated imports to match current structure
 from stock_sim.simulation_engine import SimulationEngine
 from stock_sim.utils import SP500TickerManager
-from stock_sim.analysis.reporting import generate_stock_report, generate_batch_report
+from stock_sim.analysis.reporting import generate_stock_report, generate_batch_report, atomic_open
 from stock_sim.models import ModelFactory
 from stock_sim.strategy_executor import StrategyExecutor
 
@@ -99,10 +99,11 @@ class SimulationStatus:
 
 simulation_status = SimulationStatus()
 
-# Create Flask app with appropriate static folder
-current_dir = os.path.dirname(os.path.abspath(__file__))
+# Create Flask app with appropriate static folder (current_dir is resolved once above)
 template_dir = os.path.join(current_dir, 'templates')
 static_dir = os.path.join(template_dir, 'static')
+index_template_path = os.path.join(template_dir, 'index.html')
+documentation_template_path = os.path.join(template_dir, 'documentation.html')
 
 # Explicitly create the app with absolute paths
 app = Flask(__name__, 
@@ -113,7 +114,7 @@ app = Flask(__name__,
 # Print template path for debugging
 print(f"Flask app initialized with template_folder: {template_dir}")
 print(f"Static folder: {static_dir}")
-print(f"Template file exists: {os.path.exists(os.path.join(template_dir, 'index.html'))}")
+print(f"Template file exists: {os.path.exists(index_template_path)}")
 
 @app.route('/')
 def index():
@@ -134,8 +135,7 @@ def index():
     
     try:
         # Include full path for debugging
-        template_path = os.path.join(template_dir, 'index.html')
-        print(f"Rendering template from: {template_path}")
+        print(f"Rendering template from: {index_template_path}")
         
         return render_template('index.html', 
                               sectors=SECTORS, 
@@ -150,8 +150,7 @@ def index():
 def documentation():
     """Render the documentation page."""
     try:
-        template_path = os.path.join(template_dir, 'documentation.html')
-        print(f"Rendering documentation template from: {template_path}")
+        print(f"Rendering documentation template from: {documentation_template_path}")
         return render_template('documentation.html')
     except Exception as e:
         import traceback
@@ -888,8 +887,10 @@ def create_consolidated_report(reports_dir):
         </html>
         """
         
-        # Write the consolidated report
-        with open(consolidated_path, 'w') as f:
+        # Write the consolidated report to a temporary file and move it into
+        # place: the existing file may be a hard link to a batch report,
+        # which writing it in place would overwrite as well
+        with atomic_open(consolidated_path) as f:
             f.write(html_content)
         
         print(f"Created consolidated report: {consolidated_path}")